@@ -1,6 +1,15 @@
 #!/usr/bin/env bash
 # helpers.sh — minimal shell utilities for hook entry points
 
+HELPERS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Run a jira_core command through jira_hook.py. Running a file by path keeps
+# the hook's cwd (the user's project) off sys.path, and jira_hook.py imports
+# jira_core so its compiled bytecode is reused from __pycache__.
+run_core() {
+  python3 "$HELPERS_DIR/jira_hook.py" "$@"
+}
+
 find_project_root() {
   if [[ -n "${CLAUDE_PROJECT_DIR:-}" ]]; then
     echo "$CLAUDE_PROJECT_DIR"
@@ -18,8 +27,21 @@ json_get() {
   python3 -c "import json,sys; print(json.load(open('$1')).get('$2',''))" 2>/dev/null || echo ""
 }
 
+# Runs before every tool-call hook, so it avoids starting a second python3
+# in the common case: without an "enabled": false anywhere in the file the
+# project is enabled. Only when that text occurs is the JSON parsed, so a
+# nested "enabled" key cannot disable the plugin.
 is_enabled() {
   local root="$1"
   local cfg="$root/.claude/jira-autopilot.json"
-  [[ -f "$cfg" ]] && [[ "$(json_get "$cfg" enabled)" != "false" ]]
+  [[ -f "$cfg" ]] || return 1
+  grep -Eq '"enabled"[[:space:]]*:[[:space:]]*false' "$cfg" || return 0
+  python3 -I -c '
+import json, sys
+try:
+    cfg = json.load(open(sys.argv[1]))
+except (OSError, ValueError):
+    cfg = {}
+sys.exit(isinstance(cfg, dict) and cfg.get("enabled") is False)
+' "$cfg"
 }
@@ -1,17 +1,27 @@
 #!/usr/bin/env python3
 """jira_core.py — Core business logic for jira-autopilot v4."""
 
-import base64
+# Every hook runs this module in a fresh process, so import time is paid on
+# each tool call. Modules only some commands need (subprocess, base64,
+# urllib, http.client) are imported inside the functions that use them.
+import atexit
+import functools
 import json
 import math
 import os
 import re
-import subprocess
 import sys
-import tempfile
 import time
-import urllib.request
-import urllib.error
+
+try:
+    import fcntl  # POSIX only; elsewhere the activity log is not locked
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson  # optional: faster session/config (de)serialization
+except ImportError:
+    orjson = None
 
 # ── Constants ──────────────────────────────────────────────
 
@@ -19,18 +29,37 @@ GLOBAL_CONFIG_PATH = os.path.expanduser("~/.claude/jira-autopilot.global.json")
 DEBUG_LOG_PATH = os.path.expanduser("~/.claude/jira-autopilot-debug.log")
 API_LOG_PATH = os.path.expanduser("~/.claude/jira-autopilot-api.log")
 MAX_LOG_SIZE = 1_000_000  # 1MB
+LOG_FLUSH_LINES = 64
 MAX_WORKLOG_SECONDS = 14400  # 4 hours
 STALE_ISSUE_SECONDS = 86400  # 24 hours
-
-READ_ONLY_TOOLS = {
+SESSION_FSYNC_INTERVAL = 60  # seconds, for sessionFsync="periodic"
+PROJECT_PAGE_WORKERS = 4  # concurrent project-search page fetches
+RETRY_MAX_DELAY = 8  # seconds; longer Retry-After waits are not worth blocking a hook
+HTTP_TIMEOUT = 15  # seconds per socket operation on Jira requests
+HTTP_MAX_REDIRECTS = 10  # as urllib's HTTPRedirectHandler
+ACTIVITY_LOG_COMPACT_EVERY = 100  # fold the activity log into the session after N entries
+
+READ_ONLY_TOOLS = frozenset({
     "Read", "Glob", "Grep", "LS", "WebSearch", "WebFetch",
     "TodoRead", "NotebookRead", "AskUserQuestion", "TaskList",
     "TaskGet", "ToolSearch", "Skill", "Task", "ListMcpResourcesTool",
     "BashOutput",
+})
+
+# Activity "type" by tool name; any other logged tool is "other"
+ACTIVITY_TYPES = {
+    "Edit": "file_edit", "MultiEdit": "file_edit",
+    "Write": "file_write",
+    "Bash": "bash",
 }
 
+# Unescaped quotes only occur outside JSON strings, so this can only hit a key
+_READ_ONLY_TOOL_RE = re.compile(
+    r'"tool_name"\s*:\s*"(?:' + "|".join(map(re.escape, sorted(READ_ONLY_TOOLS))) + r')"'
+)
+
 PLANNING_SKILL_PATTERNS = ["plan", "brainstorm", "spec", "explore", "research"]
-PLANNING_IMPL_TOOLS = {"Edit", "Write", "MultiEdit", "NotebookEdit"}
+PLANNING_IMPL_TOOLS = frozenset({"Edit", "Write", "MultiEdit", "NotebookEdit"})
 
 BUG_SIGNALS = [
     "fix", "bug", "broken", "crash", "error", "fail",
@@ -41,6 +70,14 @@ TASK_SIGNALS = [
     "update", "improve", "migrate", "setup", "configure",
 ]
 
+# Every signal in one alternation, so a summary is scanned once for both
+# classes; _SIGNAL_KIND maps each hit back to its class. The lookahead makes
+# matches zero-width, so like an Aho-Corasick scan it reports signals that
+# overlap in the text ("createrror" -> create, error) rather than skipping
+# past the first one.
+_SIGNAL_KIND = {**dict.fromkeys(BUG_SIGNALS, "bug"), **dict.fromkeys(TASK_SIGNALS, "task")}
+_SIGNAL_RE = re.compile("(?=(" + "|".join(map(re.escape, BUG_SIGNALS + TASK_SIGNALS)) + "))")
+
 CREDENTIAL_PATTERNS = [
     (r"ATATT3x[A-Za-z0-9_/+=.\-]+", "[REDACTED_TOKEN]"),
     (r"Bearer [A-Za-z0-9_/+=.\-]+", "Bearer [REDACTED]"),
@@ -49,17 +86,38 @@ CREDENTIAL_PATTERNS = [
     (r'"apiToken"\s*:\s*"[^"]+"', '"apiToken": "[REDACTED]"'),
 ]
 
+# Applied one after another, in order: a token is redacted whole before the
+# header patterns see it, so "Basic ATATT3x..." cannot leave a token tail.
+_CREDENTIAL_SUBS = [
+    (re.compile(pattern), replacement) for pattern, replacement in CREDENTIAL_PATTERNS
+]
+# Literal text every credential pattern starts with. Most log lines contain
+# none of these, and a few substring checks are far cheaper than a regex scan.
+_CRED_PREFIXES = ("ATATT3x", "Bearer ", "Basic ", "-u ", '"apiToken"')
+
+# ── Clock ──────────────────────────────────────────────────
+
+_HOOK_NOW = None  # set once per hook by main()
+
+
+def _now():
+    """Current time in whole seconds, fixed for the duration of one hook.
+
+    A hook process finishes in well under a second, so every handler shares
+    the timestamp main() took on entry. Outside main() (tests, imports) this
+    falls back to the live clock.
+    """
+    return _HOOK_NOW if _HOOK_NOW is not None else int(time.time())
+
 # ── Logging ────────────────────────────────────────────────
 
 
 def _rotate_log(path):
     """Rotate log file if it exceeds MAX_LOG_SIZE."""
     try:
-        if os.path.exists(path) and os.path.getsize(path) > MAX_LOG_SIZE:
-            backup = path + ".1"
-            if os.path.exists(backup):
-                os.remove(backup)
-            os.rename(path, backup)
+        if os.stat(path).st_size > MAX_LOG_SIZE:
+            # os.replace overwrites an old backup in the same call
+            os.replace(path, path + ".1")
     except OSError:
         pass
 
@@ -68,55 +126,179 @@ def sanitize_for_log(text):
     """Redact credentials from text."""
     if not isinstance(text, str):
         text = str(text)
-    for pattern, replacement in CREDENTIAL_PATTERNS:
-        text = re.sub(pattern, replacement, text)
+    if not any(prefix in text for prefix in _CRED_PREFIXES):
+        return text
+    for pattern, replacement in _CREDENTIAL_SUBS:
+        text = pattern.sub(replacement, text)
     return text
 
 
-def debug_log(message, root=None):
-    """Write sanitized message to debug log."""
-    cfg = {}
-    if root:
-        cfg = load_config(root)
-    if not cfg.get("debugLog", True):
+_LOG_BUFFERS = {}  # log path -> pending lines, flushed in batches
+_LOG_HANDLES = {}  # log path -> open append handle, kept for the process
+_log_ts_second = None
+_log_ts_text = ""
+
+
+def _log_timestamp():
+    """Local time for log lines; re-formatted at most once per second."""
+    global _log_ts_second, _log_ts_text
+    now = int(time.time())
+    if now != _log_ts_second:
+        _log_ts_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _log_ts_second = now
+    return _log_ts_text
+
+
+def _append_log(path, message, flush=False):
+    """Queue a sanitized, timestamped line; write out once the batch is full."""
+    ts = _log_timestamp()
+    lines = _LOG_BUFFERS.setdefault(path, [])
+    lines.append(f"[{ts}] {sanitize_for_log(message)}\n")
+    if flush or len(lines) >= LOG_FLUSH_LINES:
+        _flush_log(path)
+
+
+def _log_handle(path):
+    """Long-lived append handle for path, reopened if the file was rotated."""
+    fh = _LOG_HANDLES.get(path)
+    if fh is not None:
+        try:
+            if os.fstat(fh.fileno()).st_ino == os.stat(path).st_ino:
+                return fh
+        except OSError:
+            pass
+        fh.close()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fh = open(path, "a", buffering=65536)
+    _LOG_HANDLES[path] = fh
+    return fh
+
+
+def _flush_log(path):
+    """Write all pending lines for one log file with a single append."""
+    lines = _LOG_BUFFERS.pop(path, None)
+    if not lines:
         return
-    _rotate_log(DEBUG_LOG_PATH)
+    _rotate_log(path)
     try:
-        os.makedirs(os.path.dirname(DEBUG_LOG_PATH), exist_ok=True)
-        with open(DEBUG_LOG_PATH, "a") as f:
-            ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{ts}] {sanitize_for_log(message)}\n")
+        fh = _log_handle(path)
+        fh.write("".join(lines))
+        fh.flush()
     except OSError:
         pass
 
 
+def flush_logs():
+    """Write out every pending log line."""
+    for path in list(_LOG_BUFFERS):
+        _flush_log(path)
+
+
+def _close_logs():
+    """Flush pending lines and close log handles. Registered to run at exit."""
+    flush_logs()
+    for fh in _LOG_HANDLES.values():
+        try:
+            fh.close()
+        except OSError:
+            pass
+    _LOG_HANDLES.clear()
+
+
+atexit.register(_close_logs)
+
+
+def is_debug_enabled(root=None):
+    """Whether debug logging is on for root (config is cached, so this is cheap).
+
+    Callers that build large messages should check this before formatting.
+    """
+    if not root:
+        return True
+    return load_config(root).get("debugLog", True)
+
+
+def debug_log(message, root=None):
+    """Write sanitized message to debug log (buffered until flush_logs)."""
+    if not is_debug_enabled(root):
+        return
+    _append_log(DEBUG_LOG_PATH, message)
+
+
 def api_log(message):
-    """Write sanitized message to API log."""
-    _rotate_log(API_LOG_PATH)
-    try:
-        os.makedirs(os.path.dirname(API_LOG_PATH), exist_ok=True)
-        with open(API_LOG_PATH, "a") as f:
-            ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{ts}] {sanitize_for_log(message)}\n")
-    except OSError:
-        pass
+    """Write sanitized message to API log.
+
+    API log lines record failures, so they are flushed immediately — if the
+    hook is killed on timeout the line must already be on disk.
+    """
+    _append_log(API_LOG_PATH, message, flush=True)
 
 
 # ── Atomic File I/O ────────────────────────────────────────
 
 
-def atomic_write_json(path, data):
-    """Write JSON atomically: temp file -> fsync -> os.replace."""
+def atomic_write_json(path, data, durable=True):
+    """Write JSON atomically: temp file -> fsync -> os.replace.
+
+    durable=False skips the fsync. os.replace still swaps the file in
+    atomically, so readers never see a torn write; only a power loss can
+    roll the file back to its previous version.
+    """
+    _atomic_write_bytes(path, _json_dumps_bytes(data), durable)
+
+
+def _json_dumps_bytes(data):
+    """Serialize to indented UTF-8 JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _json_dumps_line(data):
+    """Serialize to one compact, newline-terminated JSON line (bytes)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _json_loads(raw):
+    """Parse JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _fdatasync(fd):
+    """Flush file data to disk, skipping the timestamp-only metadata fsync adds.
+
+    The new file's size is still flushed, which is all a reader needs. macOS
+    has no fdatasync, so it falls back to fsync there.
+    """
+    (getattr(os, "fdatasync", None) or os.fsync)(fd)
+
+
+def _atomic_write_bytes(path, payload, durable=True, mode=0o600):
+    """Atomically replace path with payload. Returns the new file's stat.
+
+    The replacement is created with mode (before umask), not the old file's.
+
+    The temp name is fixed per (path, pid) rather than drawn by mkstemp:
+    one open() instead of a random-name probe loop, and concurrent hook
+    processes still never share a temp file.
+    """
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(
-        dir=os.path.dirname(path) or ".",
-        suffix=".tmp",
-    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
     try:
-        with os.fdopen(fd, "w") as f:
-            json.dump(data, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            if durable:
+                _fdatasync(fd)
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
         os.replace(tmp_path, path)
     except Exception:
         try:
@@ -124,34 +306,79 @@ def atomic_write_json(path, data):
         except OSError:
             pass
         raise
+    return st
+
+
+def _stat_key(st):
+    """Identity of a file version: changes on any rewrite or replace."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
 
 
 # ── Config Loading ─────────────────────────────────────────
 
 
+_CONFIG_CACHE = {}  # path -> ((mtime_ns, size, ino), parsed dict)
+
+
 def load_config(root):
     """Load project config from .claude/jira-autopilot.json."""
     path = os.path.join(root, ".claude", "jira-autopilot.json")
-    return _load_json(path)
+    return _load_json_cached(path)
 
 
 def _load_json(path):
     """Load JSON file, returning {} on any error."""
     try:
-        with open(path) as f:
-            return json.load(f)
-    except (OSError, json.JSONDecodeError, ValueError):
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
         return {}
 
 
+def _load_json_cached(path):
+    """Like _load_json, but reuse the parsed dict while the file is unchanged.
+
+    Keyed on the file's stat, so an edit (or atomic replace) invalidates it.
+    For config files only — callers must not mutate the returned dict.
+    """
+    try:
+        key = _stat_key(os.stat(path))
+    except OSError:
+        _CONFIG_CACHE.pop(path, None)
+        return {}
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    data = _load_json(path)
+    _CONFIG_CACHE[path] = (key, data)
+    return data
+
+
+_CRED_CACHE = {}  # root -> (local dict, global dict, merged view)
+
+
+def _merged_creds(root):
+    """Local-over-global credential view, rebuilt only when either file changes.
+
+    _load_json_cached hands back the same dict objects while the files are
+    unchanged, so identity checks are enough to validate the merged view.
+    """
+    local_path = os.path.join(root, ".claude", "jira-autopilot.local.json")
+    local = _load_json_cached(local_path)
+    global_cfg = _load_json_cached(GLOBAL_CONFIG_PATH)
+    cached = _CRED_CACHE.get(root)
+    if cached and cached[0] is local and cached[1] is global_cfg:
+        return cached[2]
+    merged = dict(global_cfg)
+    # Empty local values fall through to the global config
+    merged.update((k, v) for k, v in local.items() if v)
+    _CRED_CACHE[root] = (local, global_cfg, merged)
+    return merged
+
+
 def get_cred(root, key):
     """Get credential with local -> global fallback."""
-    local_path = os.path.join(root, ".claude", "jira-autopilot.local.json")
-    local = _load_json(local_path)
-    if local.get(key):
-        return local[key]
-    global_cfg = _load_json(GLOBAL_CONFIG_PATH)
-    return global_cfg.get(key, "")
+    return _merged_creds(root).get(key, "")
 
 
 # ── Session Management ─────────────────────────────────────
@@ -174,67 +401,255 @@ def _new_session():
         "activeTasks": {},
         "taskSubjects": {},
         "activePlanning": None,
-        "lastWorklogTime": int(time.time()),
+        "lastWorklogTime": _now(),
     }
 
 
+_SESSION_KEYS = frozenset(_new_session())
+
+
 def _ensure_session_structure(session):
-    """Fill missing keys with defaults. Additive only."""
-    defaults = _new_session()
-    for key, value in defaults.items():
-        if key not in session:
-            session[key] = value
+    """Fill missing keys with defaults. Additive only.
+
+    Sessions written by this version already have every key, so the common
+    case is one set comparison. Defaults are only built when something is
+    missing, and fresh each time so no two sessions share a container.
+    """
+    if session.keys() >= _SESSION_KEYS:
+        return session
+    for key, value in _new_session().items():
+        session.setdefault(key, value)
     return session
 
 
+# session path -> (stat key, bytes, pendingWorklogs bytes) last read/written.
+# A session is a few kilobytes, so the bytes are kept and compared directly.
+_SESSION_SNAPSHOTS = {}
+
+
+def _pending_bytes(session):
+    return _json_dumps_bytes(session.get("pendingWorklogs") or [])
+
+
 def load_session(root):
     """Load session state, ensuring all required fields exist."""
     path = os.path.join(root, ".claude", "jira-session.json")
-    session = _load_json(path)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+            st = os.fstat(f.fileno())
+        session = _json_loads(raw)
+    except (OSError, ValueError):
+        return {}
+    _SESSION_SNAPSHOTS[path] = (_stat_key(st), raw, _pending_bytes(session))
     if session:
         session = _ensure_session_structure(session)
+        _replay_activity_log(root, session)
     return session
 
 
+def _session_fsync_due(root, path):
+    """Decide whether this session save should fsync, per sessionFsync config.
+
+    "never" (default) relies on os.replace atomicity; a crash loses at most
+    the last tool call. "always" fsyncs every save. "periodic" fsyncs the
+    first save in each SESSION_FSYNC_INTERVAL window, using the current
+    file's mtime as the record of the previous save.
+    """
+    mode = load_config(root).get("sessionFsync", "never")
+    if mode == "always":
+        return True
+    if mode == "periodic":
+        try:
+            last = os.stat(path).st_mtime
+        except OSError:
+            return True
+        return int(last) // SESSION_FSYNC_INTERVAL != _now() // SESSION_FSYNC_INTERVAL
+    return False
+
+
 def save_session(root, session):
-    """Save session state atomically."""
+    """Save session state atomically.
+
+    Skipped when the serialized session is byte-identical to the file we
+    last read or wrote and that file has not been replaced since.
+
+    Most session state is cheap to lose: os.replace is atomic on POSIX even
+    without an fsync, so a crash can only roll the file back to an earlier
+    complete version, costing at most the last few activities. Pending
+    worklogs are the exception — losing one loses logged time, and losing
+    its removal double-posts it — so any save that changes pendingWorklogs
+    is fsynced regardless of sessionFsync.
+    """
     path = os.path.join(root, ".claude", "jira-session.json")
-    atomic_write_json(path, session)
+    payload = _json_dumps_bytes(session)
+    if not _session_unchanged(path, payload):
+        pending = _pending_bytes(session)
+        snapshot = _SESSION_SNAPSHOTS.get(path)
+        durable = (snapshot is None and bool(session.get("pendingWorklogs"))) \
+            or (snapshot is not None and snapshot[2] != pending) \
+            or _session_fsync_due(root, path)
+        st = _atomic_write_bytes(path, payload, durable=durable)
+        _SESSION_SNAPSHOTS[path] = (_stat_key(st), payload, pending)
+    _compact_activity_log(root)
+
+
+def _session_unchanged(path, payload):
+    """True if path still holds exactly the payload we last read or wrote."""
+    snapshot = _SESSION_SNAPSHOTS.get(path)
+    if not snapshot or snapshot[1] != payload:
+        return False
+    try:
+        return _stat_key(os.stat(path)) == snapshot[0]
+    except OSError:
+        return False
+
 
+# ── Activity Log ───────────────────────────────────────────
+#
+# PostToolUse appends each activity as one JSON line to
+# .claude/jira-activity.jsonl instead of rewriting the whole session.
+# load_session replays the log into activityBuffer; the next save_session
+# writes those entries into the snapshot and drops them from the log.
 
-# ── CLI Dispatcher (stub — expanded in later tasks) ────────
+ACTIVITY_LOG_MODE = 0o644
+_ACTIVITY_LOG_READS = {}  # log path -> the bytes load_session replayed
+
+
+def _activity_log_path(root):
+    return os.path.join(root, ".claude", "jira-activity.jsonl")
+
+
+def _lock_activity_log(fd):
+    """Hold an exclusive lock on the open log until fd is closed."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _is_current_log(fd, path):
+    """True when fd is still the file at path (compaction replaces it)."""
+    try:
+        return os.fstat(fd).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def append_activity(root, activity):
+    """Append one activity to the log with a single O_APPEND write.
+
+    The write happens under the log lock, so it cannot land between
+    compaction reading the log and replacing it.
+    """
+    path = _activity_log_path(root)
+    line = _json_dumps_line(activity)
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, ACTIVITY_LOG_MODE)
+        try:
+            _lock_activity_log(fd)
+            if _is_current_log(fd, path):
+                os.write(fd, line)
+                return
+        finally:
+            os.close(fd)
+
+
+def _activity_log_length(root):
+    """Number of complete entries in the activity log."""
+    try:
+        with open(_activity_log_path(root), "rb") as f:
+            return f.read().count(b"\n")
+    except OSError:
+        return 0
+
+
+def _peek_session(root):
+    """Parse the session file without load_session's snapshot or log replay.
+
+    For callers that only read a few fields and never save the session.
+    """
+    try:
+        with open(os.path.join(root, ".claude", "jira-session.json"), "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def _replay_activity_log(root, session):
+    """Append logged activities to session["activityBuffer"]."""
+    path = _activity_log_path(root)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        _ACTIVITY_LOG_READS.pop(path, None)
+        return
+    # A line without its newline is still being written — leave it for later
+    end = raw.rfind(b"\n") + 1
+    for line in raw[:end].splitlines():
+        try:
+            session["activityBuffer"].append(_json_loads(line))
+        except ValueError:
+            continue
+    _ACTIVITY_LOG_READS[path] = raw[:end]
+
+
+def _discard_activity_log(root):
+    """Remove the log; its entries belong to a session that no longer exists."""
+    path = _activity_log_path(root)
+    _ACTIVITY_LOG_READS.pop(path, None)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _compact_activity_log(root):
+    """Drop log entries that the session snapshot now holds.
+
+    Only the bytes replayed by load_session are removed; anything appended
+    since then is kept for the next load. Another process may have compacted
+    (or truncated) the log since our load, so the replayed bytes are checked
+    under the lock to still be the log's head before they are dropped.
+    """
+    path = _activity_log_path(root)
+    replayed = _ACTIVITY_LOG_READS.pop(path, None)
+    if not replayed:
+        return
+    try:
+        with open(path, "r+b") as f:
+            # Appenders wait on this lock until the rewrite below is done
+            _lock_activity_log(f.fileno())
+            if not _is_current_log(f.fileno(), path):
+                return
+            data = f.read()
+            if not data.startswith(replayed):
+                return
+            tail = data[len(replayed):]
+            if tail:
+                _atomic_write_bytes(path, tail, durable=False, mode=ACTIVITY_LOG_MODE)
+            else:
+                os.ftruncate(f.fileno(), 0)
+    except OSError:
+        pass
+
+
+# ── CLI Dispatcher ─────────────────────────────────────────
 
 
 def main():
+    global _HOOK_NOW
+    _HOOK_NOW = int(time.time())
     if len(sys.argv) < 2:
         print(json.dumps({"error": "Usage: jira_core.py <command> [args...]"}))
         sys.exit(1)
 
-    commands = {
-        "session-start": cmd_session_start,
-        "log-activity": cmd_log_activity,
-        "drain-buffer": cmd_drain_buffer,
-        "session-end": cmd_session_end,
-        "post-worklogs": cmd_post_worklogs,
-        "pre-tool-use": cmd_pre_tool_use,
-        "user-prompt-submit": cmd_user_prompt_submit,
-        "classify-issue": cmd_classify_issue,
-        "auto-create-issue": cmd_auto_create_issue,
-        "suggest-parent": cmd_suggest_parent,
-        "build-worklog": cmd_build_worklog,
-        "create-issue": cmd_create_issue,
-        "get-issue": cmd_get_issue,
-        "add-worklog": cmd_add_worklog,
-        "get-projects": cmd_get_projects,
-        "debug-log": cmd_debug_log,
-    }
-
     cmd = sys.argv[1]
-    if cmd not in commands:
+    handler = _COMMANDS.get(cmd)
+    if handler is None:
         print(json.dumps({"error": f"Unknown command: {cmd}"}))
         sys.exit(1)
 
-    commands[cmd]()
+    handler()
 
 
 # ── Idle Threshold ─────────────────────────────────────────
@@ -262,19 +677,15 @@ def classify_issue(summary, context=None):
     Returns: {type: "Bug"|"Task", confidence: float, signals: list[str]}
     """
     lower = summary.lower()
+    found = set(_SIGNAL_RE.findall(lower))
     bug_score = 0
     task_score = 0
-    signals = []
-
-    for signal in BUG_SIGNALS:
-        if signal in lower:
+    for signal in found:
+        if _SIGNAL_KIND[signal] == "bug":
             bug_score += 1
-            signals.append(signal)
-
-    for signal in TASK_SIGNALS:
-        if signal in lower:
+        else:
             task_score += 1
-            signals.append(signal)
+    signals = [s for s in _SIGNAL_KIND if s in found]
 
     # Context boosts
     if context:
@@ -370,9 +781,9 @@ def build_worklog(root, issue_key):
             # Include null chunks when this is the sole active issue
             chunks.append(chunk)
 
-    # Aggregate data
-    all_files = []
-    all_commands = []
+    # Aggregate data; dicts dedupe in O(1) and keep first-seen order
+    all_files = {}
+    all_commands = {}
     total_activities = 0
     total_seconds = 0
 
@@ -384,15 +795,14 @@ def build_worklog(root, issue_key):
         chunk_seconds = max(0, end - start - idle_time)
         total_seconds += chunk_seconds
 
-        for f in chunk.get("filesChanged", []):
-            if f not in all_files:
-                all_files.append(f)
+        all_files.update(dict.fromkeys(chunk.get("filesChanged", [])))
 
-        for act in chunk.get("activities", []):
-            total_activities += 1
+        activities = chunk.get("activities", [])
+        total_activities += len(activities)
+        for act in activities:
             cmd = act.get("command", "")
-            if cmd and cmd not in all_commands:
-                all_commands.append(sanitize_for_log(cmd))
+            if cmd:
+                all_commands[sanitize_for_log(cmd)] = None
 
     capped = False
     if total_seconds > MAX_WORKLOG_SECONDS:
@@ -415,8 +825,8 @@ def build_worklog(root, issue_key):
         "seconds": total_seconds,
         "summary": summary,
         "rawFacts": {
-            "files": all_files,
-            "commands": all_commands,
+            "files": list(all_files),
+            "commands": list(all_commands),
             "activityCount": total_activities,
         },
         "logLanguage": cfg.get("logLanguage", "English"),
@@ -430,6 +840,34 @@ def build_worklog(root, issue_key):
 # ── Command Implementations ───────────────────────────────
 
 
+def _current_branch(root):
+    """Current git branch name ("HEAD" when detached, "" outside a repo).
+
+    Reads .git/HEAD directly so session start does not fork git. Where .git
+    is not a directory under root (worktrees, submodules, a subdirectory of
+    the repo) it falls back to git rev-parse.
+    """
+    try:
+        with open(os.path.join(root, ".git", "HEAD"), "rb") as f:
+            head = f.read().decode().strip()
+    except (OSError, UnicodeDecodeError):
+        head = None
+    if head is not None:
+        ref = "ref: refs/heads/"
+        return head[len(ref):] if head.startswith(ref) else "HEAD"
+
+    import subprocess
+
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            cwd=root,
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (subprocess.CalledProcessError, OSError):
+        return ""
+
+
 def cmd_session_start():
     """SessionStart hook handler."""
     root = sys.argv[2] if len(sys.argv) > 2 else os.getcwd()
@@ -454,7 +892,7 @@ def cmd_session_start():
             session["accuracy"] = cfg["accuracy"]
 
         # Prune stale issues (>24h old, zero totalSeconds)
-        now = int(time.time())
+        now = _now()
         active = session.get("activeIssues", {})
         to_prune = []
         for key, issue in active.items():
@@ -466,7 +904,9 @@ def cmd_session_start():
             if session.get("currentIssue") == key:
                 session["currentIssue"] = None
     else:
-        # New session
+        # New session — activities logged for a lost or corrupt session
+        # would otherwise be replayed into it and billed to its issues
+        _discard_activity_log(root)
         session = _new_session()
         if "autonomyLevel" in cfg:
             session["autonomyLevel"] = cfg["autonomyLevel"]
@@ -476,24 +916,21 @@ def cmd_session_start():
     # Auto-detect issue from git branch whenever no issue is active
     if not session.get("currentIssue") and not session.get("activeIssues"):
         branch_pattern = cfg.get("branchPattern")
-        if branch_pattern:
+        branch = _current_branch(root) if branch_pattern else ""
+        if branch:
             try:
-                branch = subprocess.check_output(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    stderr=subprocess.DEVNULL,
-                ).decode().strip()
                 match = re.search(branch_pattern, branch)
                 if match:
                     issue_key = match.group(1)
                     session["currentIssue"] = issue_key
                     session["activeIssues"][issue_key] = {
                         "summary": f"From branch: {branch}",
-                        "startTime": int(time.time()),
+                        "startTime": _now(),
                         "totalSeconds": 0,
                         "paused": False,
                     }
                     debug_log(f"session-start: auto-linked {issue_key} from branch {branch}", root)
-            except (subprocess.CalledProcessError, OSError, IndexError):
+            except IndexError:
                 pass
 
     save_session(root, session)
@@ -510,30 +947,40 @@ def cmd_log_activity():
     if cfg.get("enabled") is False:
         return
 
-    session = load_session(root)
-    if not session:
-        return
-
-    if session.get("disabled"):
-        return
-
     # Read tool JSON from stdin
     try:
         raw = sys.stdin.read()
         if not isinstance(raw, str):
             # Fallback for mock environments
             raw = sys.stdin.__class__.read()
-        tool_data = json.loads(raw)
+        # Skip read-only tools (most calls) before parsing or loading the
+        # session. Claude Code sends the top-level "tool_name" before
+        # "tool_input", so only a "tool_name" ahead of any "tool_input" is
+        # matched; anything else is parsed.
+        name_at = raw.find('"tool_name"')
+        input_at = raw.find('"tool_input"')
+        if name_at >= 0 and (input_at < 0 or name_at < input_at) \
+                and _READ_ONLY_TOOL_RE.match(raw, name_at):
+            return
+        tool_data = _json_loads(raw)
     except (json.JSONDecodeError, ValueError, TypeError):
         return
 
     tool_name = tool_data.get("tool_name", "")
     tool_input = tool_data.get("tool_input", {})
 
-    # Skip read-only tools
     if tool_name in READ_ONLY_TOOLS:
         return
 
+    # Only a few fields are needed; the full load (snapshot, log replay)
+    # happens only when the log is folded into the session below.
+    session = _peek_session(root)
+    if not session:
+        return
+
+    if session.get("disabled"):
+        return
+
     # Extract file path
     file_path = (
         tool_input.get("file_path", "")
@@ -545,23 +992,15 @@ def cmd_log_activity():
     if file_path and "/.claude/" in file_path:
         return
 
-    # Determine activity type
-    if tool_name in ("Edit", "MultiEdit"):
-        activity_type = "file_edit"
-    elif tool_name == "Write":
-        activity_type = "file_write"
-    elif tool_name == "Bash":
-        activity_type = "bash"
-    else:
-        activity_type = "other"
+    activity_type = ACTIVITY_TYPES.get(tool_name, "other")
 
     # Build command (for Bash tools)
     command = ""
-    if tool_name == "Bash":
+    if activity_type == "bash":
         command = sanitize_for_log(tool_input.get("command", ""))
 
     activity = {
-        "timestamp": int(time.time()),
+        "timestamp": _now(),
         "tool": tool_name,
         "type": activity_type,
         "issueKey": session.get("currentIssue"),
@@ -569,8 +1008,10 @@ def cmd_log_activity():
         "command": command,
     }
 
-    session["activityBuffer"].append(activity)
-    save_session(root, session)
+    append_activity(root, activity)
+    if _activity_log_length(root) >= ACTIVITY_LOG_COMPACT_EVERY:
+        # Fold the log into the snapshot so replay cost stays bounded
+        save_session(root, load_session(root))
 
     debug_log(f"log-activity: tool={tool_name} file={file_path}", root)
 
@@ -594,52 +1035,38 @@ def cmd_drain_buffer():
 
     idle_threshold = _get_idle_threshold(cfg)
 
-    # Split into groups by idle gaps and issue key changes
-    groups = []
-    current_group = [buffer[0]]
-
-    for i in range(1, len(buffer)):
-        prev = buffer[i - 1]
-        curr = buffer[i]
-        gap = curr.get("timestamp", 0) - prev.get("timestamp", 0)
-        issue_changed = curr.get("issueKey") != prev.get("issueKey")
-
-        if gap > idle_threshold or issue_changed:
-            groups.append(current_group)
-            current_group = [curr]
-        else:
-            current_group.append(curr)
-
-    groups.append(current_group)
-
-    # Convert groups to work chunks
+    # One sweep: start a new chunk at each idle gap or issue key change.
+    # Files are deduplicated through a dict, which keeps first-seen order.
     new_chunks = []
-    for group in groups:
-        if not group:
-            continue
-
-        start_time = group[0].get("timestamp", 0)
-        end_time = group[-1].get("timestamp", 0)
-        issue_key = group[0].get("issueKey")
-
-        # Collect unique files
-        files_changed = []
-        for act in group:
-            f = act.get("file", "")
-            if f and f not in files_changed:
-                files_changed.append(f)
-
-        chunk = {
-            "id": f"chunk-{start_time}-{len(new_chunks)}",
-            "issueKey": issue_key,
-            "startTime": start_time,
-            "endTime": end_time,
-            "activities": group,
-            "filesChanged": files_changed,
-            "idleGaps": [],
-            "needsAttribution": issue_key is None,
-        }
-        new_chunks.append(chunk)
+    chunk = None
+    files = None
+    prev_ts = None
+    for act in buffer:
+        ts = act.get("timestamp", 0)
+        issue_key = act.get("issueKey")
+        if chunk is None or ts - prev_ts > idle_threshold or issue_key != chunk["issueKey"]:
+            if chunk is not None:
+                chunk["filesChanged"] = list(files)
+                new_chunks.append(chunk)
+            chunk = {
+                "id": f"chunk-{ts}-{len(new_chunks)}",
+                "issueKey": issue_key,
+                "startTime": ts,
+                "endTime": ts,
+                "activities": [],
+                "filesChanged": [],
+                "idleGaps": [],
+                "needsAttribution": issue_key is None,
+            }
+            files = {}
+        chunk["endTime"] = ts
+        chunk["activities"].append(act)
+        f = act.get("file", "")
+        if f:
+            files[f] = None
+        prev_ts = ts
+    chunk["filesChanged"] = list(files)
+    new_chunks.append(chunk)
 
     session["workChunks"].extend(new_chunks)
     session["activityBuffer"] = []
@@ -699,7 +1126,7 @@ def cmd_session_end():
                 "issueKey": issue_key,
                 "seconds": total_seconds,
                 "comment": comment,
-                "timestamp": int(time.time()),
+                "timestamp": _now(),
             })
 
     # Save session with any pending worklogs
@@ -754,10 +1181,13 @@ def cmd_pre_tool_use():
     """PreToolUse hook: inject issue key into git commit messages."""
     root = sys.argv[2] if len(sys.argv) > 2 else os.getcwd()
 
-    # Read hook input from stdin
+    # Read hook input from stdin. Every tool call runs this hook; a payload
+    # without a "Bash" string cannot be a Bash call, so skip parsing it.
     try:
         raw = sys.stdin.read()
-        hook_input = json.loads(raw)
+        if '"Bash"' not in raw:
+            return
+        hook_input = _json_loads(raw)
     except (json.JSONDecodeError, ValueError):
         return
 
@@ -817,7 +1247,7 @@ def cmd_user_prompt_submit():
     if start_time <= 0:
         return
 
-    elapsed = int(time.time()) - start_time
+    elapsed = _now() - start_time
     if elapsed < 0:
         elapsed = 0
 
@@ -942,6 +1372,8 @@ def cmd_get_projects():
 def cmd_debug_log():
     """CLI wrapper for debug_log — log a message from the command line."""
     root = sys.argv[2] if len(sys.argv) > 2 else os.getcwd()
+    if not is_debug_enabled(root):
+        return
 
     # Message from argv or stdin
     if len(sys.argv) > 3:
@@ -975,18 +1407,131 @@ def _text_to_adf(text):
 # ── Jira REST API Client ─────────────────────────────────
 
 
+_HTTP_CONNS = {}  # (scheme, host:port) -> idle http.client connections
+_HTTP_PROXIES = None  # urllib proxy settings, read from the environment once
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+
+def _http_open(req, redirects=0):
+    """Send a urllib Request over a kept-alive connection to its host.
+
+    A drop-in for urllib.request.urlopen as jira_request uses it: returns a
+    readable context manager and raises HTTPError on error statuses. Later
+    requests to the same Jira host skip the TCP and TLS handshakes. Falls
+    back to urlopen when a proxy is configured.
+
+    GET and HEAD redirects are followed. Any other redirected request has
+    already reached the first endpoint, so its 3xx is raised as an
+    HTTPError rather than sent again.
+    """
+    global _HTTP_PROXIES
+    import http.client
+    import io
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
+    if _HTTP_PROXIES is None:
+        _HTTP_PROXIES = urllib.request.getproxies()
+    parts = urllib.parse.urlsplit(req.full_url)
+    if parts.scheme not in ("http", "https") or _HTTP_PROXIES:
+        return urllib.request.urlopen(req, timeout=HTTP_TIMEOUT)
+
+    # list.pop/append are atomic, so concurrent page fetches can share the pool
+    idle = _HTTP_CONNS.setdefault((parts.scheme, parts.netloc), [])
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    while True:
+        try:
+            conn = idle.pop()
+        except IndexError:
+            conn = None
+        reused = conn is not None
+        if conn is None:
+            cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = cls(parts.netloc, timeout=HTTP_TIMEOUT)
+        sent = False
+        try:
+            conn.request(req.get_method(), target, body=req.data, headers=dict(req.header_items()))
+            sent = True
+            resp = conn.getresponse()
+            payload = resp.read()
+        except (http.client.HTTPException, ConnectionError):
+            conn.close()
+            # The server dropped the idle connection; redial. Once the request
+            # went out it may already have been processed, so only idempotent
+            # methods are sent again.
+            if reused and (not sent or req.get_method() in _IDEMPOTENT_METHODS):
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            idle.append(conn)
+        break
+
+    location = resp.headers.get("Location")
+    if (resp.status in _REDIRECT_STATUSES and location
+            and req.get_method() in ("GET", "HEAD") and redirects < HTTP_MAX_REDIRECTS):
+        redirected = urllib.request.Request(
+            urllib.parse.urljoin(req.full_url, location),
+            headers=dict(req.header_items()), method=req.get_method(),
+        )
+        return _http_open(redirected, redirects + 1)
+    if resp.status >= 300:
+        raise urllib.error.HTTPError(req.full_url, resp.status, resp.reason, resp.headers, io.BytesIO(payload))
+    return io.BytesIO(payload)
+
+
+def _retry_delay(attempt, code, headers):
+    """Seconds to wait before retrying a 429/503 response, or None to give up.
+
+    Exponential backoff from 1s, never shorter than the server's Retry-After,
+    plus up to 50% random jitter so concurrent hooks do not retry in
+    lockstep. Gives up when the server asks for more than RETRY_MAX_DELAY,
+    and on a 503 that carries no Retry-After.
+    """
+    import random
+
+    try:
+        retry_after = float(headers.get("Retry-After"))
+    except (ValueError, TypeError, AttributeError):
+        retry_after = None
+    if retry_after is None and code == 503:
+        return None
+    delay = max(2 ** attempt, retry_after or 0)
+    if delay > RETRY_MAX_DELAY:
+        return None
+    return min(delay + random.uniform(0, delay / 2), RETRY_MAX_DELAY)
+
+
+@functools.lru_cache(maxsize=8)
+def _basic_auth(email, api_token):
+    """Authorization header value for a credential pair."""
+    import base64
+
+    return "Basic " + base64.b64encode(f"{email}:{api_token}".encode()).decode()
+
+
 def jira_request(root, method, path, body=None, max_retries=3):
     """Authenticated HTTP request to Jira REST API.
 
     Returns parsed JSON response dict. On error returns {"error": ...}.
-    Retries on 429 (rate limited) with backoff.
+    Retries 429 (rate limited) and 503-with-Retry-After responses with
+    capped, jittered backoff (see _retry_delay).
     """
-    base_url = get_cred(root, "baseUrl").rstrip("/")
-    email = get_cred(root, "email")
-    api_token = get_cred(root, "apiToken")
+    import http.client
+    import urllib.error
+    import urllib.request
 
+    base_url = get_cred(root, "baseUrl").rstrip("/")
     url = base_url + path
-    auth_str = base64.b64encode(f"{email}:{api_token}".encode()).decode()
+    auth = _basic_auth(get_cred(root, "email"), get_cred(root, "apiToken"))
 
     data = None
     if body is not None:
@@ -994,28 +1539,25 @@ def jira_request(root, method, path, body=None, max_retries=3):
 
     for attempt in range(max_retries):
         req = urllib.request.Request(url, data=data, method=method)
-        req.add_header("Authorization", f"Basic {auth_str}")
+        req.add_header("Authorization", auth)
         req.add_header("Content-Type", "application/json")
         req.add_header("Accept", "application/json")
 
         try:
-            with urllib.request.urlopen(req) as resp:
+            with _http_open(req) as resp:
                 resp_data = resp.read()
                 if resp_data:
-                    return json.loads(resp_data)
+                    return _json_loads(resp_data)
                 return {}
         except urllib.error.HTTPError as e:
-            if e.code == 429 and attempt < max_retries - 1:
-                retry_after = 1
-                try:
-                    retry_after = int(e.headers.get("Retry-After", "1"))
-                except (ValueError, TypeError, AttributeError):
-                    pass
-                time.sleep(retry_after)
-                continue
+            if e.code in (429, 503) and attempt < max_retries - 1:
+                delay = _retry_delay(attempt, e.code, e.headers)
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
             api_log(f"HTTP {e.code} {method} {path}")
             return {"error": f"HTTP {e.code}: {e.msg}"}
-        except (urllib.error.URLError, OSError) as e:
+        except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
             api_log(f"Network error {method} {path}: {e}")
             return {"error": str(e)}
 
@@ -1023,37 +1565,59 @@ def jira_request(root, method, path, body=None, max_retries=3):
 
 
 def jira_get_projects(root):
-    """Fetch all Jira projects with pagination. Returns list of {key, name}."""
-    projects = []
-    start_at = 0
+    """Fetch all Jira projects with pagination. Returns list of {key, name}.
+
+    The first page reports the total, so the remaining pages are fetched
+    concurrently. Without a total, pages are walked one by one.
+    """
     max_results = 50
 
-    while True:
+    def fetch(start_at):
         try:
             result = jira_request(
                 root, "GET",
                 f"/rest/api/3/project/search?startAt={start_at}&maxResults={max_results}",
             )
         except Exception:
-            return []
-
+            return None
         if not result or "error" in result:
-            if not projects:
-                return []
-            break
-
-        values = result.get("values", [])
-        for p in values:
-            projects.append({"key": p["key"], "name": p["name"]})
-
-        if result.get("isLast", True):
-            break
-
-        start_at += len(values)
-        if not values:
-            break
+            return None
+        return result
 
-    return projects
+    first = fetch(0)
+    if first is None:
+        return []
+    pages = [first]
+
+    values = first.get("values", [])
+    total = first.get("total")
+    if not first.get("isLast", True) and values:
+        if isinstance(total, int):
+            from concurrent.futures import ThreadPoolExecutor
+
+            offsets = range(len(values), total, len(values))
+            with ThreadPoolExecutor(max_workers=PROJECT_PAGE_WORKERS) as pool:
+                for page in pool.map(fetch, offsets):
+                    if page is None:
+                        break
+                    pages.append(page)
+        else:
+            start_at = len(values)
+            while True:
+                page = fetch(start_at)
+                if page is None:
+                    break
+                pages.append(page)
+                page_values = page.get("values", [])
+                if page.get("isLast", True) or not page_values:
+                    break
+                start_at += len(page_values)
+
+    return [
+        {"key": p["key"], "name": p["name"]}
+        for page in pages
+        for p in page.get("values", [])
+    ]
 
 
 def create_issue(root, project_key, summary, issue_type="Task", description="", parent_key=None):
@@ -1170,12 +1734,39 @@ def _build_worklog_comment(issue_key, work_chunks):
 
 
 def _archive_session(root, session):
-    """Archive session to .claude/jira-sessions/<sessionId>.json."""
+    """Archive session to .claude/jira-sessions/<sessionId>.json.
+
+    Not fsynced: the archive is a copy of jira-session.json, which stays in
+    place, and any pending worklogs were already made durable by save_session.
+    """
     session_id = session.get("sessionId", time.strftime("%Y%m%d-%H%M%S"))
     archive_dir = os.path.join(root, ".claude", "jira-sessions")
     os.makedirs(archive_dir, exist_ok=True)
     archive_path = os.path.join(archive_dir, f"{session_id}.json")
-    atomic_write_json(archive_path, session)
+    atomic_write_json(archive_path, session, durable=False)
+
+
+# ── Command Table ──────────────────────────────────────────
+
+# Built once at import; main() resolves sys.argv[1] against it.
+_COMMANDS = {
+    "session-start": cmd_session_start,
+    "log-activity": cmd_log_activity,
+    "drain-buffer": cmd_drain_buffer,
+    "session-end": cmd_session_end,
+    "post-worklogs": cmd_post_worklogs,
+    "pre-tool-use": cmd_pre_tool_use,
+    "user-prompt-submit": cmd_user_prompt_submit,
+    "classify-issue": cmd_classify_issue,
+    "auto-create-issue": cmd_auto_create_issue,
+    "suggest-parent": cmd_suggest_parent,
+    "build-worklog": cmd_build_worklog,
+    "create-issue": cmd_create_issue,
+    "get-issue": cmd_get_issue,
+    "add-worklog": cmd_add_worklog,
+    "get-projects": cmd_get_projects,
+    "debug-log": cmd_debug_log,
+}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,10 @@
+"""Hook entry point: run jira_core as an imported module.
+
+helpers.sh runs this file by path, so sys.path[0] is this directory rather
+than the hook's cwd (the user's project) — a project-local json.py or
+jira_core.py can never shadow ours. Importing jira_core, instead of running
+it as __main__, lets Python reuse its cached bytecode on every hook.
+"""
+import jira_core
+
+jira_core.main()
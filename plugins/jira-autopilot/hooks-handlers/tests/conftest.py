@@ -1,12 +1,58 @@
-import pytest
+import json
 import os
+import sys
+
+import pytest
+
+# Make jira_core importable from every test module. Runs once, before any
+# test module is collected.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Imported here, once, so an import error fails collection up front and the
+# fixtures below patch the module object instead of re-resolving it by name.
+import jira_core  # noqa: E402
 
 
 @pytest.fixture(autouse=True)
 def isolate_global_config(tmp_path, monkeypatch):
     """Prevent tests from using real global credentials."""
     fake_global = str(tmp_path / "nonexistent-global.json")
-    monkeypatch.setattr("jira_core.GLOBAL_CONFIG_PATH", fake_global)
+    monkeypatch.setattr(jira_core, "GLOBAL_CONFIG_PATH", fake_global)
+    # Per-test log files: api_log writes through immediately, and parallel
+    # workers (pytest -n) must not share, or pollute, ~/.claude logs
+    monkeypatch.setattr(jira_core, "DEBUG_LOG_PATH", str(tmp_path / "debug.log"))
+    monkeypatch.setattr(jira_core, "API_LOG_PATH", str(tmp_path / "api.log"))
+    # Fresh log buffers so lines never leak between tests (or into ~/.claude)
+    monkeypatch.setattr(jira_core, "_LOG_BUFFERS", {})
+    log_handles = {}
+    monkeypatch.setattr(jira_core, "_LOG_HANDLES", log_handles)
+    monkeypatch.setattr(jira_core, "_CONFIG_CACHE", {})
+    monkeypatch.setattr(jira_core, "_CRED_CACHE", {})
+    monkeypatch.setattr(jira_core, "_SESSION_SNAPSHOTS", {})
+    monkeypatch.setattr(jira_core, "_ACTIVITY_LOG_READS", {})
+    monkeypatch.setattr(jira_core, "_HOOK_NOW", None)
+    http_conns = {}
+    monkeypatch.setattr(jira_core, "_HTTP_CONNS", http_conns)
+    monkeypatch.setattr(jira_core, "_HTTP_PROXIES", None)
+    yield
+    for fh in log_handles.values():
+        fh.close()
+    for idle in http_conns.values():
+        for conn in idle:
+            conn.close()
+
+
+FROZEN_NOW = 1_700_000_000
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin the wall clock so timestamps derived in tests and in jira_core agree.
+
+    Opt-in: code comparing the clock against real file mtimes (periodic
+    session fsync, stale-file checks) needs the live clock.
+    """
+    monkeypatch.setattr("time.time", lambda: FROZEN_NOW)
 
 
 @pytest.fixture
@@ -15,3 +61,20 @@ def project_root(tmp_path):
     claude_dir = tmp_path / ".claude"
     claude_dir.mkdir()
     return tmp_path
+
+
+_DEFAULT_CONFIG = {"projectKey": "TEST", "enabled": True}
+_DEFAULT_CONFIG_BYTES = json.dumps(_DEFAULT_CONFIG).encode()
+
+
+@pytest.fixture
+def write_config(project_root):
+    """Return a writer for the project config: the defaults plus overrides.
+
+    The common default is encoded once per session, not per test.
+    """
+    def write(**overrides):
+        payload = json.dumps({**_DEFAULT_CONFIG, **overrides}).encode() if overrides else _DEFAULT_CONFIG_BYTES
+        (project_root / ".claude" / "jira-autopilot.json").write_bytes(payload)
+
+    return write
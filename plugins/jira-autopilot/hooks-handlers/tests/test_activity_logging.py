@@ -1,10 +1,11 @@
 import json
-import sys
 import os
+import threading
 import time
 from unittest.mock import patch
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
+
 import jira_core
 
 
@@ -17,13 +18,19 @@ def _make_tool_input(tool_name, tool_input=None, tool_response="OK"):
     })
 
 
+# Built once at import: payloads for read-only tools that must not be logged
+_READ_ONLY_TOOL_INPUTS = {
+    tool: _make_tool_input(tool, {"file_path": "/src/foo.ts"})
+    for tool in sorted(jira_core.READ_ONLY_TOOLS)
+}
+
+
 class TestCmdLogActivity:
     """Tests for cmd_log_activity() — PostToolUse hook handler."""
 
-    def test_appends_tool_call_to_activity_buffer(self, project_root):
+    def test_appends_tool_call_to_activity_buffer(self, project_root, write_config):
         """A file-editing tool call should be appended to activityBuffer."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         session = jira_core._new_session()
         session["currentIssue"] = "TEST-1"
@@ -48,10 +55,9 @@ class TestCmdLogActivity:
         activity = reloaded["activityBuffer"][-1]
         assert activity["tool"] == "Edit"
 
-    def test_includes_timestamp_tool_name_and_file(self, project_root):
+    def test_includes_timestamp_tool_name_and_file(self, project_root, write_config):
         """Activity records should contain timestamp, tool, and file path."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         session = jira_core._new_session()
         jira_core.save_session(str(project_root), session)
@@ -70,28 +76,88 @@ class TestCmdLogActivity:
         assert activity["tool"] == "Write"
         assert "file" in activity or "file_path" in activity.get("tool_input", {})
 
-    def test_skips_read_only_tools(self, project_root):
+    @pytest.mark.parametrize("tool", _READ_ONLY_TOOL_INPUTS)
+    def test_skips_read_only_tools(self, project_root, write_config, tool):
         """Read-only tools (Read, Glob, Grep, etc.) should NOT be logged."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         session = jira_core._new_session()
         jira_core.save_session(str(project_root), session)
 
-        for tool in ["Read", "Glob", "Grep", "WebSearch"]:
-            tool_json = _make_tool_input(tool, {"file_path": "/src/foo.ts"})
+        tool_json = _READ_ONLY_TOOL_INPUTS[tool]
+        with patch("sys.argv", ["jira_core.py", "log-activity", str(project_root)]), \
+             patch("sys.stdin", __class__=type("FakeStdin", (), {"read": lambda self: tool_json})()):
+            jira_core.cmd_log_activity()
+
+        reloaded = jira_core.load_session(str(project_root))
+        assert len(reloaded["activityBuffer"]) == 0, \
+            "Read-only tools should not be logged"
+
+    @pytest.mark.parametrize("tool", _READ_ONLY_TOOL_INPUTS)
+    def test_read_only_tools_skip_session_load(self, project_root, write_config, tool):
+        """Read-only calls return before the session is read."""
+        write_config()
+        jira_core.load_config(str(project_root))  # config is cached, not under test
+
+        tool_json = _READ_ONLY_TOOL_INPUTS[tool]
+        with patch("sys.argv", ["jira_core.py", "log-activity", str(project_root)]), \
+             patch("sys.stdin", __class__=type("FakeStdin", (), {"read": lambda self: tool_json})()), \
+             patch("jira_core.load_session") as mock_load, \
+             patch("jira_core._json_loads") as mock_parse:
+            jira_core.cmd_log_activity()
+
+        mock_load.assert_not_called()
+        mock_parse.assert_not_called()
+
+    def test_read_only_name_inside_input_is_still_logged(self, project_root, write_config):
+        """Read-only tool names quoted in content or nested keys do not skip a write."""
+        write_config()
+        jira_core.save_session(str(project_root), jira_core._new_session())
+
+        payloads = (
+            _make_tool_input("Write", {"file_path": "/src/a.json", "content": '{"tool_name": "Read"}'}),
+            _make_tool_input("Edit", {"file_path": "/src/b.ts", "tool_name": "Read"}),
+        )
+        for tool_json in payloads:
             with patch("sys.argv", ["jira_core.py", "log-activity", str(project_root)]), \
                  patch("sys.stdin", __class__=type("FakeStdin", (), {"read": lambda self: tool_json})()):
                 jira_core.cmd_log_activity()
 
         reloaded = jira_core.load_session(str(project_root))
-        assert len(reloaded["activityBuffer"]) == 0, \
-            "Read-only tools should not be logged"
+        assert [a["tool"] for a in reloaded["activityBuffer"]] == ["Write", "Edit"]
+
+    def test_read_only_name_in_input_before_top_level_key_is_still_logged(self, project_root, write_config):
+        """Only a "tool_name" ahead of "tool_input" is taken as the top-level one."""
+        write_config()
+        jira_core.save_session(str(project_root), jira_core._new_session())
+        tool_json = json.dumps({
+            "tool_input": {"file_path": "/src/a.ts", "tool_name": "Read"},
+            "tool_name": "Edit",
+        })
+
+        with patch("sys.argv", ["jira_core.py", "log-activity", str(project_root)]), \
+             patch("sys.stdin", __class__=type("FakeStdin", (), {"read": lambda self: tool_json})()):
+            jira_core.cmd_log_activity()
+
+        reloaded = jira_core.load_session(str(project_root))
+        assert [a["tool"] for a in reloaded["activityBuffer"]] == ["Edit"]
+
+    def test_read_only_tool_with_nested_tool_name_skips_parse(self, project_root, write_config):
+        """A nested "tool_name" after the top-level read-only one does not force a parse."""
+        write_config()
+        jira_core.load_config(str(project_root))  # config is cached, not under test
+        tool_json = _make_tool_input("Read", {"file_path": "/src/a.json"}, {"tool_name": "Edit"})
 
-    def test_skips_claude_dir_file_writes(self, project_root):
+        with patch("sys.argv", ["jira_core.py", "log-activity", str(project_root)]), \
+             patch("sys.stdin", __class__=type("FakeStdin", (), {"read": lambda self: tool_json})()), \
+             patch("jira_core._json_loads") as mock_parse:
+            jira_core.cmd_log_activity()
+
+        mock_parse.assert_not_called()
+
+    def test_skips_claude_dir_file_writes(self, project_root, write_config):
         """Writes to .claude/ directory should not be logged (internal state)."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         session = jira_core._new_session()
         jira_core.save_session(str(project_root), session)
@@ -108,10 +174,9 @@ class TestCmdLogActivity:
         assert len(reloaded["activityBuffer"]) == 0, \
             ".claude/ file writes should not be logged"
 
-    def test_handles_missing_session_gracefully(self, project_root):
+    def test_handles_missing_session_gracefully(self, project_root, write_config):
         """If no session exists, log-activity should not crash."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         tool_json = _make_tool_input("Edit", {"file_path": "/src/foo.ts"})
 
@@ -120,10 +185,9 @@ class TestCmdLogActivity:
             # Should not raise
             jira_core.cmd_log_activity()
 
-    def test_sanitizes_credentials_in_bash_commands(self, project_root):
+    def test_sanitizes_credentials_in_bash_commands(self, project_root, write_config):
         """Bash commands containing credentials should be sanitized."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         session = jira_core._new_session()
         jira_core.save_session(str(project_root), session)
@@ -143,10 +207,9 @@ class TestCmdLogActivity:
             assert "ATATT3xSECRET123" not in command, \
                 "Credentials should be sanitized in logged commands"
 
-    def test_assigns_current_issue_key_to_activity(self, project_root):
+    def test_assigns_current_issue_key_to_activity(self, project_root, write_config):
         """Activity should be tagged with the current active issue key."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        write_config()
 
         session = jira_core._new_session()
         session["currentIssue"] = "TEST-42"
@@ -167,10 +230,9 @@ class TestCmdLogActivity:
         activity = reloaded["activityBuffer"][-1]
         assert activity.get("issueKey") == "TEST-42"
 
-    def test_disabled_plugin_skips_logging(self, project_root):
+    def test_disabled_plugin_skips_logging(self, project_root, write_config):
         """When plugin is disabled, no activity should be logged."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": False}))
+        write_config(enabled=False)
 
         session = jira_core._new_session()
         session["disabled"] = True
@@ -184,3 +246,155 @@ class TestCmdLogActivity:
 
         reloaded = jira_core.load_session(str(project_root))
         assert len(reloaded.get("activityBuffer", [])) == 0
+
+
+class TestActivityLog:
+    """Tests for the append-only activity log behind activityBuffer."""
+
+    def _log_edit(self, project_root, path="/src/foo.ts"):
+        tool_json = _make_tool_input("Edit", {"file_path": path})
+        with patch("sys.argv", ["jira_core.py", "log-activity", str(project_root)]), \
+             patch("sys.stdin", __class__=type("FakeStdin", (), {"read": lambda self: tool_json})()):
+            jira_core.cmd_log_activity()
+
+    @pytest.fixture(autouse=True)
+    def _start(self, project_root, write_config):
+        """Each test starts from a configured project with a saved session."""
+        write_config()
+        jira_core.save_session(str(project_root), jira_core._new_session())
+
+    def test_logging_appends_without_rewriting_session(self, project_root):
+        session_path = project_root / ".claude" / "jira-session.json"
+        before = session_path.read_bytes()
+
+        self._log_edit(project_root)
+
+        assert session_path.read_bytes() == before
+        lines = (project_root / ".claude" / "jira-activity.jsonl").read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["file"] == "/src/foo.ts"
+
+    def test_logging_skips_full_session_load(self, project_root):
+        """A logged call reads session fields without replaying the log."""
+        session = jira_core.load_session(str(project_root))
+        session["currentIssue"] = "TEST-7"
+        jira_core.save_session(str(project_root), session)
+
+        with patch("jira_core.load_session") as mock_load:
+            self._log_edit(project_root)
+
+        mock_load.assert_not_called()
+        line = (project_root / ".claude" / "jira-activity.jsonl").read_text()
+        assert json.loads(line)["issueKey"] == "TEST-7"
+
+    def test_save_folds_log_into_session(self, project_root):
+        self._log_edit(project_root, "/src/a.ts")
+        self._log_edit(project_root, "/src/b.ts")
+
+        root = str(project_root)
+        jira_core.save_session(root, jira_core.load_session(root))
+
+        assert (project_root / ".claude" / "jira-activity.jsonl").read_bytes() == b""
+        stored = json.loads((project_root / ".claude" / "jira-session.json").read_bytes())
+        assert [a["file"] for a in stored["activityBuffer"]] == ["/src/a.ts", "/src/b.ts"]
+
+    def test_entries_appended_after_load_survive_compaction(self, project_root):
+        self._log_edit(project_root, "/src/a.ts")
+        root = str(project_root)
+        session = jira_core.load_session(root)
+
+        self._log_edit(project_root, "/src/late.ts")
+        jira_core.save_session(root, session)
+
+        reloaded = jira_core.load_session(root)
+        assert [a["file"] for a in reloaded["activityBuffer"]] == ["/src/a.ts", "/src/late.ts"]
+
+    def _append_during(self, project_root, monkeypatch, target, name):
+        """Run target.name with a concurrent append racing its rewrite."""
+        root = str(project_root)
+        real = getattr(target, name)
+        appender = threading.Thread(
+            target=jira_core.append_activity, args=(root, {"tool": "Edit", "file": "/src/race.ts"}),
+        )
+
+        def racing(*args, **kwargs):
+            appender.start()
+            time.sleep(0.05)  # give the append time to land if it is not blocked
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(target, name, racing)
+        return appender
+
+    def test_append_during_compaction_rewrite_survives(self, project_root, monkeypatch):
+        self._log_edit(project_root, "/src/a.ts")
+        self._log_edit(project_root, "/src/b.ts")
+        root = str(project_root)
+        jira_core.load_session(root)
+        self._log_edit(project_root, "/src/late.ts")  # unreplayed tail -> rewrite path
+        appender = self._append_during(project_root, monkeypatch, jira_core, "_atomic_write_bytes")
+
+        # Only the compaction rewrite goes through _atomic_write_bytes here
+        jira_core._compact_activity_log(root)
+        appender.join()
+
+        reloaded = jira_core.load_session(root)
+        assert [a["file"] for a in reloaded["activityBuffer"]] == ["/src/late.ts", "/src/race.ts"]
+
+    def test_append_during_compaction_truncate_survives(self, project_root, monkeypatch):
+        self._log_edit(project_root, "/src/a.ts")
+        root = str(project_root)
+        jira_core.load_session(root)
+        appender = self._append_during(project_root, monkeypatch, os, "ftruncate")
+
+        jira_core._compact_activity_log(root)
+        appender.join()
+
+        lines = (project_root / ".claude" / "jira-activity.jsonl").read_text().splitlines()
+        assert [json.loads(line)["file"] for line in lines] == ["/src/race.ts"]
+
+    def test_stale_loader_keeps_entries_logged_after_another_compaction(self, project_root):
+        """A hook that loaded before another one compacted must not drop newer entries."""
+        self._log_edit(project_root, "/src/a.ts")
+        root = str(project_root)
+        stale = jira_core.load_session(root)
+        stale_read = dict(jira_core._ACTIVITY_LOG_READS)
+
+        jira_core.save_session(root, jira_core.load_session(root))  # the other hook
+        self._log_edit(project_root, "/src/b.ts")
+        jira_core._ACTIVITY_LOG_READS.update(stale_read)
+        jira_core.save_session(root, stale)
+
+        reloaded = jira_core.load_session(root)
+        assert [a["file"] for a in reloaded["activityBuffer"]] == ["/src/a.ts", "/src/b.ts"]
+
+    def test_compaction_keeps_log_file_mode(self, project_root):
+        self._log_edit(project_root, "/src/a.ts")
+        log_path = project_root / ".claude" / "jira-activity.jsonl"
+        mode = log_path.stat().st_mode
+        root = str(project_root)
+        session = jira_core.load_session(root)
+        self._log_edit(project_root, "/src/late.ts")  # unreplayed tail -> rewrite path
+
+        jira_core.save_session(root, session)
+
+        assert log_path.read_text().count("\n") == 1
+        assert log_path.stat().st_mode == mode
+
+    def test_torn_trailing_line_is_ignored(self, project_root):
+        self._log_edit(project_root)
+        log_path = project_root / ".claude" / "jira-activity.jsonl"
+        with open(log_path, "ab") as f:
+            f.write(b'{"tool": "Ed')
+
+        session = jira_core.load_session(str(project_root))
+
+        assert len(session["activityBuffer"]) == 1
+
+    def test_compacts_at_threshold(self, project_root, monkeypatch):
+        monkeypatch.setattr(jira_core, "ACTIVITY_LOG_COMPACT_EVERY", 3)
+        for i in range(3):
+            self._log_edit(project_root, f"/src/{i}.ts")
+
+        stored = json.loads((project_root / ".claude" / "jira-session.json").read_bytes())
+        assert len(stored["activityBuffer"]) == 3
+        assert (project_root / ".claude" / "jira-activity.jsonl").read_bytes() == b""
@@ -1,14 +1,11 @@
 """Tests for auto issue creation — classify_issue(), _attempt_auto_create()."""
 
 import json
-import os
-import sys
 import time
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
 
@@ -88,7 +85,7 @@ class TestClassifyIssue:
 class TestAutoCreateIssue:
     """Tests for _attempt_auto_create() — automatic Jira issue creation."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_creates_issue_with_correct_project_key(self, mock_urlopen, project_root):
         """_attempt_auto_create() uses the configured project key."""
         _setup_project(project_root, autonomy="A", auto_create=True)
@@ -112,7 +109,7 @@ class TestAutoCreateIssue:
         body = json.loads(req.data.decode("utf-8"))
         assert body["fields"]["project"]["key"] == "TEST"
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_uses_classification_for_issue_type(self, mock_urlopen, project_root):
         """_attempt_auto_create() classifies as Bug when bug signals present."""
         _setup_project(project_root, autonomy="A", auto_create=True)
@@ -145,7 +142,7 @@ class TestAutoCreateIssue:
         # Should not create anything for Cautious mode
         assert result is None or result == {} or result.get("key") is None
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_suggests_parent_from_context(self, mock_urlopen, project_root):
         """_attempt_auto_create() uses lastParentKey as parent hint."""
         _setup_project(project_root, autonomy="A", auto_create=True)
@@ -190,7 +187,7 @@ class TestAutoCreateIssue:
 
         assert result is None or result == {} or result.get("key") is None
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_validates_project_key_against_jira(self, mock_urlopen, project_root):
         """_attempt_auto_create() validates project key exists in Jira."""
         _setup_project(project_root, autonomy="A", auto_create=True)
@@ -222,7 +219,7 @@ class TestAutoCreateIssue:
 class TestAutonomyLevels:
     """Tests for autonomy level behavior in issue creation."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_autonomy_a_auto_creates(self, mock_urlopen, project_root):
         """Autonomy A with autoCreate=true creates issues automatically."""
         _setup_project(project_root, autonomy="A", auto_create=True)
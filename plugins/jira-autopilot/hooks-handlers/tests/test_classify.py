@@ -1,30 +1,39 @@
 import json
-import sys
-import os
 from unittest.mock import patch
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
+
 import jira_core
 
 
 class TestClassifyIssue:
     """Tests for issue classification logic (cmd_classify_issue / classify_issue)."""
 
-    def test_detects_bug_signals(self):
-        """Summaries with bug keywords should classify as Bug."""
+    @pytest.mark.parametrize("summary,context,expected", [
+        ("Fix broken login crash on mobile", None, "Bug"),
+        ("Implement new user registration flow", None, "Task"),
+        # Work chunk summary (file list style)
+        ("Fix crash in auth.ts, login.tsx", None, "Bug"),
+        ("Create build pipeline and configure CI", None, "Task"),
+        ("FIX BROKEN AUTH CRASH", None, "Bug"),
+        # No signals defaults to Task
+        ("Something about the system", None, "Task"),
+        # Per spec 6.2: new_files_created == 0 && files_edited > 0 → +1 bug score
+        ("Fix the login page", {"new_files_created": 0, "files_edited": 3}, "Bug"),
+        # Per spec 6.2: new_files_created > 0 → +1 task score
+        ("Add authentication module", {"new_files_created": 5, "files_edited": 0}, "Task"),
+    ])
+    def test_classifies_type(self, summary, context, expected):
+        """Summaries (plus optional file context) classify as Bug or Task."""
+        assert jira_core.classify_issue(summary, context=context)["type"] == expected
+
+    def test_signals_raise_confidence_above_baseline(self):
+        """Matched signals are reported and lift confidence past 0.5."""
         # Per spec 6.2: bug_score >= 2, or bug_score > task_score and >= 1
-        result = jira_core.classify_issue("Fix broken login crash on mobile")
-        assert result["type"] == "Bug"
-        assert result["confidence"] > 0.5
-        # Should find signals like "fix", "broken", "crash"
-        assert len(result["signals"]) >= 1
-
-    def test_detects_task_signals(self):
-        """Summaries with task keywords should classify as Task."""
-        result = jira_core.classify_issue("Implement new user registration flow")
-        assert result["type"] == "Task"
-        assert result["confidence"] > 0.5
-        assert len(result["signals"]) >= 1
+        for summary in ("Fix broken login crash on mobile", "Implement new user registration flow"):
+            result = jira_core.classify_issue(summary)
+            assert result["confidence"] > 0.5
+            assert len(result["signals"]) >= 1
 
     def test_returns_confidence_score(self):
         """Classification result should include a float confidence in [0, 1]."""
@@ -46,39 +55,26 @@ class TestClassifyIssue:
         assert isinstance(result["confidence"], float)
         assert "signals" in result
 
-    def test_classifies_from_work_chunk_summary(self):
-        """Should classify from a work chunk summary (file list style)."""
-        result = jira_core.classify_issue("Fix crash in auth.ts, login.tsx")
-        assert result["type"] == "Bug"
-
-    def test_pure_task_summary(self):
-        """Summary with only task signals should classify as Task."""
-        result = jira_core.classify_issue("Create build pipeline and configure CI")
-        assert result["type"] == "Task"
-
-    def test_case_insensitive(self):
-        """Classification should be case-insensitive."""
-        result = jira_core.classify_issue("FIX BROKEN AUTH CRASH")
-        assert result["type"] == "Bug"
-
-    def test_no_signals_defaults_to_task(self):
-        """When no signals are found, should default to Task."""
-        result = jira_core.classify_issue("Something about the system")
-        assert result["type"] == "Task"
-
-    def test_context_boosts_bug_score(self):
-        """Context with no new files and edited files should boost bug score."""
-        # Per spec 6.2: new_files_created == 0 && files_edited > 0 → +1 bug score
-        context = {"new_files_created": 0, "files_edited": 3}
-        result = jira_core.classify_issue("Fix the login page", context=context)
-        assert result["type"] == "Bug"
-
-    def test_context_boosts_task_score(self):
-        """Context with new files created should boost task score."""
-        # Per spec 6.2: new_files_created > 0 → +1 task score
-        context = {"new_files_created": 5, "files_edited": 0}
-        result = jira_core.classify_issue("Add authentication module", context=context)
-        assert result["type"] == "Task"
+    def test_repeated_signal_counted_once(self):
+        """Each signal contributes once, however often it appears."""
+        result = jira_core.classify_issue("Fix the fix for the other fix")
+        assert result["signals"] == ["fix"]
+        assert result["confidence"] == jira_core.classify_issue("Fix it")["confidence"]
+
+    def test_signals_reported_bug_first(self):
+        """Signals keep list order: bug signals, then task signals."""
+        result = jira_core.classify_issue("Add retry and fix crash")
+        assert result["signals"] == ["fix", "crash", "add"]
+
+    def test_overlapping_signals_all_found(self):
+        """Signals sharing characters in the text are each detected."""
+        result = jira_core.classify_issue("configurefactor createrror")
+        assert result["signals"] == ["error", "create", "refactor", "configure"]
+
+    def test_inflected_signals_match(self):
+        """Signals match inside inflected words, not only as whole words."""
+        result = jira_core.classify_issue("Fixes crashes in failing builds")
+        assert result["signals"] == ["fix", "crash", "fail", "build"]
 
 
 class TestCmdClassifyIssue:
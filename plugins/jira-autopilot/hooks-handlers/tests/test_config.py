@@ -1,9 +1,10 @@
 import json
 import pytest
+import subprocess
 import sys
 import os
+from pathlib import Path
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
 
@@ -24,6 +25,20 @@ class TestLoadConfig:
         cfg = jira_core.load_config(str(project_root))
         assert cfg == {}
 
+    def test_unchanged_config_is_served_from_cache(self, project_root, monkeypatch):
+        cfg_path = project_root / ".claude" / "jira-autopilot.json"
+        cfg_path.write_text(json.dumps({"projectKey": "TEST"}))
+        first = jira_core.load_config(str(project_root))
+        monkeypatch.setattr("jira_core._load_json", lambda path: pytest.fail("re-parsed"))
+        assert jira_core.load_config(str(project_root)) is first
+
+    def test_rewritten_config_is_reloaded(self, project_root):
+        cfg_path = project_root / ".claude" / "jira-autopilot.json"
+        cfg_path.write_text(json.dumps({"projectKey": "OLD"}))
+        assert jira_core.load_config(str(project_root))["projectKey"] == "OLD"
+        jira_core.atomic_write_json(str(cfg_path), {"projectKey": "NEWER"})
+        assert jira_core.load_config(str(project_root))["projectKey"] == "NEWER"
+
 
 class TestGetCred:
     def test_local_config_takes_priority(self, project_root):
@@ -40,13 +55,29 @@ class TestGetCred:
     def test_missing_creds_returns_empty(self, project_root):
         assert jira_core.get_cred(str(project_root), "email") == ""
 
+    def test_empty_local_value_falls_back_to_global(self, project_root, tmp_path, monkeypatch):
+        global_cfg = tmp_path / "global.json"
+        global_cfg.write_text(json.dumps({"email": "global@test.com", "baseUrl": "https://g"}))
+        monkeypatch.setattr("jira_core.GLOBAL_CONFIG_PATH", str(global_cfg))
+        local = project_root / ".claude" / "jira-autopilot.local.json"
+        local.write_text(json.dumps({"email": "", "baseUrl": "https://local"}))
+        assert jira_core.get_cred(str(project_root), "email") == "global@test.com"
+        assert jira_core.get_cred(str(project_root), "baseUrl") == "https://local"
+
+    def test_merged_view_refreshes_when_local_changes(self, project_root):
+        local = str(project_root / ".claude" / "jira-autopilot.local.json")
+        jira_core.atomic_write_json(local, {"email": "old@test.com"})
+        assert jira_core.get_cred(str(project_root), "email") == "old@test.com"
+        jira_core.atomic_write_json(local, {"email": "new@test.com"})
+        assert jira_core.get_cred(str(project_root), "email") == "new@test.com"
+
 
 class TestAtomicWrite:
     def test_roundtrip_integrity(self, project_root):
         path = str(project_root / "test.json")
         data = {"key": "value", "nested": {"a": 1}}
         jira_core.atomic_write_json(path, data)
-        loaded = json.loads(open(path).read())
+        loaded = json.loads(Path(path).read_bytes())
         assert loaded == data
 
     def test_no_temp_files_left(self, project_root):
@@ -57,6 +88,117 @@ class TestAtomicWrite:
         assert "test.json" in files
         assert not any(f.endswith(".tmp") for f in files)
 
+    def test_stale_temp_file_is_overwritten(self, project_root):
+        path = str(project_root / "test.json")
+        with open(f"{path}.{os.getpid()}.tmp", "w") as f:
+            f.write('{"leftover": "from a crashed write", "padding": "xxxxxxxx"}')
+        jira_core.atomic_write_json(path, {"x": 1})
+        assert jira_core._load_json(path) == {"x": 1}
+        assert not any(f.endswith(".tmp") for f in os.listdir(str(project_root)))
+
+    def test_stdlib_fallback_matches_orjson_output(self, project_root, monkeypatch):
+        data = {"a": [], "b": {}, "c": [1, {"x": None, "y": True}], "d": "text"}
+        fast = jira_core._json_dumps_bytes(data)
+        fast_line = jira_core._json_dumps_line(data)
+        monkeypatch.setattr("jira_core.orjson", None)
+        assert jira_core._json_dumps_bytes(data) == fast
+        assert jira_core._json_dumps_line(data) == fast_line
+        path = str(project_root / "test.json")
+        jira_core.atomic_write_json(path, data)
+        assert jira_core._load_json(path) == data
+
+    def test_non_durable_write_skips_fsync(self, project_root, monkeypatch):
+        calls = []
+        monkeypatch.setattr("jira_core._fdatasync", lambda fd: calls.append(fd))
+        path = str(project_root / "test.json")
+        jira_core.atomic_write_json(path, {"x": 1}, durable=False)
+        assert calls == []
+        jira_core.atomic_write_json(path, {"x": 2})
+        assert len(calls) == 1
+        assert json.loads(Path(path).read_bytes()) == {"x": 2}
+
+    def test_durable_write_prefers_fdatasync(self, project_root, monkeypatch):
+        synced = []
+        monkeypatch.setattr("os.fdatasync", lambda fd: synced.append("data"), raising=False)
+        monkeypatch.setattr("os.fsync", lambda fd: synced.append("full"))
+        jira_core.atomic_write_json(str(project_root / "test.json"), {"x": 1})
+        assert synced == ["data"]
+
+
+class TestSessionWriteSkipping:
+    def _session_path(self, project_root):
+        return project_root / ".claude" / "jira-session.json"
+
+    def test_unchanged_session_is_not_rewritten(self, project_root):
+        root = str(project_root)
+        jira_core.save_session(root, jira_core._new_session())
+        before = os.stat(self._session_path(project_root)).st_ino
+        session = jira_core.load_session(root)
+        jira_core.save_session(root, session)
+        assert os.stat(self._session_path(project_root)).st_ino == before
+
+    def test_changed_session_is_written(self, project_root):
+        root = str(project_root)
+        jira_core.save_session(root, jira_core._new_session())
+        session = jira_core.load_session(root)
+        session["currentIssue"] = "TEST-7"
+        jira_core.save_session(root, session)
+        assert jira_core.load_session(root)["currentIssue"] == "TEST-7"
+
+    def test_externally_replaced_file_is_rewritten(self, project_root):
+        root = str(project_root)
+        session = jira_core._new_session()
+        jira_core.save_session(root, session)
+        self._session_path(project_root).write_text(json.dumps({"sessionId": "other"}))
+        jira_core.save_session(root, session)
+        assert jira_core.load_session(root)["sessionId"] == session["sessionId"]
+
+
+class TestSessionFsync:
+    def _save_with_mode(self, project_root, monkeypatch, mode):
+        cfg = {"projectKey": "TEST"}
+        if mode:
+            cfg["sessionFsync"] = mode
+        (project_root / ".claude" / "jira-autopilot.json").write_text(json.dumps(cfg))
+        calls = []
+        monkeypatch.setattr("jira_core._fdatasync", lambda fd: calls.append(fd))
+        for issue in ("TEST-1", "TEST-2"):
+            session = jira_core._new_session()
+            session["currentIssue"] = issue
+            jira_core.save_session(str(project_root), session)
+        return len(calls)
+
+    def test_default_never_fsyncs(self, project_root, monkeypatch):
+        assert self._save_with_mode(project_root, monkeypatch, None) == 0
+
+    def test_always_fsyncs_every_save(self, project_root, monkeypatch):
+        assert self._save_with_mode(project_root, monkeypatch, "always") == 2
+
+    def test_periodic_fsyncs_once_per_interval(self, project_root, monkeypatch):
+        monkeypatch.setattr("jira_core.SESSION_FSYNC_INTERVAL", 3600)
+        assert self._save_with_mode(project_root, monkeypatch, "periodic") == 1
+
+    def test_pending_worklog_changes_are_fsynced(self, project_root, monkeypatch):
+        (project_root / ".claude" / "jira-autopilot.json").write_text(json.dumps({"projectKey": "TEST"}))
+        calls = []
+        monkeypatch.setattr("jira_core._fdatasync", lambda fd: calls.append(fd))
+        root = str(project_root)
+        session = jira_core._new_session()
+        jira_core.save_session(root, session)
+        assert len(calls) == 0
+
+        session["pendingWorklogs"].append({"issueKey": "TEST-1", "seconds": 900})
+        jira_core.save_session(root, session)
+        assert len(calls) == 1
+
+        session["currentIssue"] = "TEST-1"
+        jira_core.save_session(root, session)
+        assert len(calls) == 1
+
+        session["pendingWorklogs"] = []
+        jira_core.save_session(root, session)
+        assert len(calls) == 2
+
 
 class TestSessionManagement:
     def test_new_session_has_required_fields(self):
@@ -79,6 +221,20 @@ class TestSessionManagement:
         assert result["currentIssue"] is None
         assert result["workChunks"] == []
 
+    def test_ensure_session_structure_defaults_not_shared(self):
+        a = jira_core._ensure_session_structure({"sessionId": "a"})
+        b = jira_core._ensure_session_structure({"sessionId": "b"})
+        a["workChunks"].append({"id": "x"})
+        a["activeIssues"]["KEY-1"] = {}
+        assert b["workChunks"] == []
+        assert b["activeIssues"] == {}
+
+    def test_ensure_session_structure_leaves_complete_session_alone(self):
+        session = jira_core._new_session()
+        session["workChunks"].append({"id": "x"})
+        assert jira_core._ensure_session_structure(session) is session
+        assert session["workChunks"] == [{"id": "x"}]
+
     def test_load_session_missing_file(self, project_root):
         session = jira_core.load_session(str(project_root))
         assert session == {}
@@ -89,3 +245,80 @@ class TestSessionManagement:
         jira_core.save_session(str(project_root), session)
         loaded = jira_core.load_session(str(project_root))
         assert loaded["currentIssue"] == "TEST-42"
+
+    def test_main_pins_clock_for_the_hook(self, project_root, monkeypatch):
+        clock = iter([1000.0, 2000.0, 3000.0])
+        monkeypatch.setattr("time.time", lambda: next(clock))
+        monkeypatch.setattr("sys.argv", ["jira_core.py", "classify-issue", str(project_root), "fix"])
+        jira_core.main()
+        assert jira_core._now() == 1000
+        assert jira_core._new_session()["lastWorklogTime"] == 1000
+
+
+class TestImportCost:
+    def test_hook_import_skips_network_and_subprocess_modules(self):
+        """Importing jira_core must not pull in modules only some commands use."""
+        hooks_dir = os.path.join(os.path.dirname(__file__), "..")
+        code = (
+            "import sys, jira_core; "
+            "print(sorted(m for m in ('urllib.request', 'tempfile', 'subprocess', 'hashlib') "
+            "if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-S", "-c", code], cwd=hooks_dir,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        assert out.strip() == "[]"
+
+    def test_run_core_shim_dispatches_by_import(self, project_root):
+        """helpers.sh run_core must reach main() with the hook's arguments."""
+        hooks_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        out = subprocess.run(
+            ["bash", "-c", 'source "$0/helpers.sh"; run_core classify-issue "$1" "fix crash"',
+             hooks_dir, str(project_root)],
+            cwd=str(project_root), capture_output=True, text=True, check=True,
+        ).stdout
+        assert json.loads(out)["type"] == "Bug"
+
+    def test_run_core_ignores_modules_in_project_cwd(self, project_root):
+        """Modules in the user's project must not shadow stdlib or jira_core."""
+        hooks_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        for name in ("json", "re", "hashlib", "jira_core"):
+            (project_root / f"{name}.py").write_text("raise SystemExit('shadowed')\n")
+        result = subprocess.run(
+            ["bash", "-c", 'source "$0/helpers.sh"; run_core classify-issue "$1" "fix crash"',
+             hooks_dir, str(project_root)],
+            cwd=str(project_root), capture_output=True, text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout)["type"] == "Bug"
+
+
+class TestShellIsEnabled:
+    def _is_enabled(self, project_root):
+        hooks_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        return subprocess.run(
+            ["bash", "-c", 'source "$0/helpers.sh"; is_enabled "$1"', hooks_dir, str(project_root)],
+        ).returncode == 0
+
+    def test_missing_config_is_disabled(self, project_root):
+        assert not self._is_enabled(project_root)
+
+    def test_config_without_flag_is_enabled(self, project_root):
+        (project_root / ".claude" / "jira-autopilot.json").write_text(json.dumps({"projectKey": "T"}))
+        assert self._is_enabled(project_root)
+
+    def test_enabled_false_is_disabled(self, project_root):
+        (project_root / ".claude" / "jira-autopilot.json").write_text(
+            json.dumps({"projectKey": "T", "enabled": False}, indent=2))
+        assert not self._is_enabled(project_root)
+
+    def test_compact_enabled_false_is_disabled(self, project_root):
+        (project_root / ".claude" / "jira-autopilot.json").write_text(
+            json.dumps({"projectKey": "T", "enabled": False}))
+        assert not self._is_enabled(project_root)
+
+    def test_nested_enabled_false_does_not_disable(self, project_root):
+        (project_root / ".claude" / "jira-autopilot.json").write_text(json.dumps(
+            {"projectKey": "T", "autoCreate": {"enabled": False}}, indent=2))
+        assert self._is_enabled(project_root)
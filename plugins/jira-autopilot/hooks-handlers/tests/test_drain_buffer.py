@@ -1,12 +1,12 @@
-import json
-import sys
-import os
 import time
 from unittest.mock import patch
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
+
 import jira_core
 
+pytestmark = pytest.mark.usefixtures("frozen_clock")
+
 
 def _make_activity(tool, file_path, ts, issue_key=None):
     """Create an activity record as produced by log-activity."""
@@ -20,93 +20,77 @@ def _make_activity(tool, file_path, ts, issue_key=None):
     }
 
 
+def _save_buffer(project_root, activities, **fields):
+    """Save a fresh session holding activities, plus any other session fields."""
+    session = jira_core._new_session()
+    session.update(fields)
+    session["activityBuffer"] = activities
+    jira_core.save_session(str(project_root), session)
+
+
+def _drain(project_root):
+    """Run the Stop hook's drain-buffer command and return the reloaded session."""
+    with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
+        jira_core.cmd_drain_buffer()
+    return jira_core.load_session(str(project_root))
+
+
 class TestCmdDrainBuffer:
     """Tests for cmd_drain_buffer() — Stop hook handler."""
 
-    def test_drains_activity_buffer_into_work_chunks(self, project_root):
+    def test_drains_activity_buffer_into_work_chunks(self, project_root, write_config):
         """Activities in the buffer should be converted into work chunks."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-            "autonomyLevel": "C", "accuracy": 5,
-        }))
+        write_config(autonomyLevel="C", accuracy=5)
 
         now = int(time.time())
-        session = jira_core._new_session()
-        session["currentIssue"] = "TEST-1"
-        session["activeIssues"] = {"TEST-1": {
-            "summary": "Task", "startTime": now - 600,
-            "totalSeconds": 0, "paused": False,
-        }}
-        session["activityBuffer"] = [
+        _save_buffer(project_root, [
             _make_activity("Edit", "/src/auth.ts", now - 300, "TEST-1"),
             _make_activity("Edit", "/src/auth.ts", now - 200, "TEST-1"),
             _make_activity("Write", "/src/utils.ts", now - 100, "TEST-1"),
-        ]
-        jira_core.save_session(str(project_root), session)
-
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
+        ], currentIssue="TEST-1", activeIssues={"TEST-1": {
+            "summary": "Task", "startTime": now - 600,
+            "totalSeconds": 0, "paused": False,
+        }})
 
-        reloaded = jira_core.load_session(str(project_root))
+        reloaded = _drain(project_root)
         assert len(reloaded["workChunks"]) >= 1, "Should create at least one work chunk"
         chunk = reloaded["workChunks"][0]
         assert "startTime" in chunk
         assert "endTime" in chunk
         assert chunk["issueKey"] == "TEST-1"
 
-    def test_groups_activities_by_idle_threshold(self, project_root):
+    def test_groups_activities_by_idle_threshold(self, project_root, write_config):
         """Activities separated by more than idle threshold should be in different chunks."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-            "accuracy": 5,  # Default idle threshold
-        }))
+        write_config(accuracy=5)  # Default idle threshold
 
         now = int(time.time())
-        session = jira_core._new_session()
-        session["currentIssue"] = "TEST-1"
-        session["activeIssues"] = {"TEST-1": {
-            "summary": "Task", "startTime": now - 3600,
-            "totalSeconds": 0, "paused": False,
-        }}
         # Two clusters separated by a large gap (30 minutes)
-        session["activityBuffer"] = [
+        _save_buffer(project_root, [
             _make_activity("Edit", "/src/a.ts", now - 3600, "TEST-1"),
             _make_activity("Edit", "/src/a.ts", now - 3500, "TEST-1"),
             # 30 minute gap
             _make_activity("Edit", "/src/b.ts", now - 1800, "TEST-1"),
             _make_activity("Edit", "/src/b.ts", now - 1700, "TEST-1"),
-        ]
-        jira_core.save_session(str(project_root), session)
-
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
+        ], currentIssue="TEST-1", activeIssues={"TEST-1": {
+            "summary": "Task", "startTime": now - 3600,
+            "totalSeconds": 0, "paused": False,
+        }})
 
-        reloaded = jira_core.load_session(str(project_root))
+        reloaded = _drain(project_root)
         assert len(reloaded["workChunks"]) >= 2, \
             "Activities separated by large idle gap should create separate chunks"
 
-    def test_work_chunk_has_required_fields(self, project_root):
+    def test_work_chunk_has_required_fields(self, project_root, write_config):
         """Each work chunk should have id, issueKey, startTime, endTime, activities."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-            "accuracy": 5,
-        }))
+        write_config(accuracy=5)
 
         now = int(time.time())
-        session = jira_core._new_session()
-        session["activityBuffer"] = [
+        _save_buffer(project_root, [
             _make_activity("Edit", "/src/foo.ts", now - 60, "TEST-1"),
             _make_activity("Edit", "/src/foo.ts", now - 30, "TEST-1"),
-        ]
-        jira_core.save_session(str(project_root), session)
-
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
+        ])
 
-        reloaded = jira_core.load_session(str(project_root))
+        reloaded = _drain(project_root)
         assert len(reloaded["workChunks"]) >= 1
         chunk = reloaded["workChunks"][0]
         assert "id" in chunk
@@ -115,98 +99,85 @@ class TestCmdDrainBuffer:
         assert "endTime" in chunk
         assert "activities" in chunk or "filesChanged" in chunk
 
-    def test_clears_buffer_after_draining(self, project_root):
+    def test_clears_buffer_after_draining(self, project_root, write_config):
         """Activity buffer should be empty after drain."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-        }))
+        write_config()
 
         now = int(time.time())
-        session = jira_core._new_session()
-        session["activityBuffer"] = [
+        _save_buffer(project_root, [
             _make_activity("Edit", "/src/foo.ts", now - 30, "TEST-1"),
-        ]
-        jira_core.save_session(str(project_root), session)
+        ])
 
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
-
-        reloaded = jira_core.load_session(str(project_root))
+        reloaded = _drain(project_root)
         assert reloaded["activityBuffer"] == [], \
             "Activity buffer should be cleared after drain"
 
-    def test_handles_empty_buffer(self, project_root):
+    def test_handles_empty_buffer(self, project_root, write_config):
         """Empty buffer should produce no work chunks and not crash."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-        }))
-
-        session = jira_core._new_session()
-        session["activityBuffer"] = []
-        jira_core.save_session(str(project_root), session)
+        write_config()
 
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
+        _save_buffer(project_root, [])
 
-        reloaded = jira_core.load_session(str(project_root))
+        reloaded = _drain(project_root)
         assert reloaded["activityBuffer"] == []
 
-    def test_splits_on_issue_key_change(self, project_root):
+    def test_splits_on_issue_key_change(self, project_root, write_config):
         """Activities with different issue keys should be in separate chunks."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-            "accuracy": 5,
-        }))
+        write_config(accuracy=5)
 
         now = int(time.time())
-        session = jira_core._new_session()
-        session["activeIssues"] = {
-            "TEST-1": {"summary": "Task 1", "startTime": now - 600, "totalSeconds": 0, "paused": False},
-            "TEST-2": {"summary": "Task 2", "startTime": now - 600, "totalSeconds": 0, "paused": False},
-        }
-        session["activityBuffer"] = [
+        _save_buffer(project_root, [
             _make_activity("Edit", "/src/a.ts", now - 300, "TEST-1"),
             _make_activity("Edit", "/src/a.ts", now - 250, "TEST-1"),
             _make_activity("Edit", "/src/b.ts", now - 200, "TEST-2"),
             _make_activity("Edit", "/src/b.ts", now - 150, "TEST-2"),
-        ]
-        jira_core.save_session(str(project_root), session)
-
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
+        ], activeIssues={
+            "TEST-1": {"summary": "Task 1", "startTime": now - 600, "totalSeconds": 0, "paused": False},
+            "TEST-2": {"summary": "Task 2", "startTime": now - 600, "totalSeconds": 0, "paused": False},
+        })
 
-        reloaded = jira_core.load_session(str(project_root))
-        chunks = reloaded["workChunks"]
+        chunks = _drain(project_root)["workChunks"]
         assert len(chunks) >= 2, "Different issue keys should produce separate chunks"
         issue_keys = {c["issueKey"] for c in chunks}
         assert "TEST-1" in issue_keys
         assert "TEST-2" in issue_keys
 
-    def test_aggregates_files_changed_in_chunk(self, project_root):
+    def test_aggregates_files_changed_in_chunk(self, project_root, write_config):
         """Work chunks should list the unique files changed."""
-        cfg_path = project_root / ".claude" / "jira-autopilot.json"
-        cfg_path.write_text(json.dumps({
-            "projectKey": "TEST", "enabled": True,
-        }))
+        write_config()
 
         now = int(time.time())
-        session = jira_core._new_session()
-        session["activityBuffer"] = [
+        _save_buffer(project_root, [
             _make_activity("Edit", "/src/a.ts", now - 60, "TEST-1"),
             _make_activity("Edit", "/src/a.ts", now - 50, "TEST-1"),
             _make_activity("Write", "/src/b.ts", now - 40, "TEST-1"),
-        ]
-        jira_core.save_session(str(project_root), session)
-
-        with patch("sys.argv", ["jira_core.py", "drain-buffer", str(project_root)]):
-            jira_core.cmd_drain_buffer()
+        ])
 
-        reloaded = jira_core.load_session(str(project_root))
+        reloaded = _drain(project_root)
         assert len(reloaded["workChunks"]) >= 1
         chunk = reloaded["workChunks"][0]
         files = chunk.get("filesChanged", [])
         assert "/src/a.ts" in files or "a.ts" in str(files)
         assert "/src/b.ts" in files or "b.ts" in str(files)
+
+    def test_chunk_boundaries_and_file_order(self, project_root, write_config):
+        """Each chunk spans its own activities and lists files in first-seen order."""
+        write_config()
+
+        now = int(time.time())
+        _save_buffer(project_root, [
+            _make_activity("Edit", "/src/b.ts", now - 90, "TEST-1"),
+            _make_activity("Edit", "/src/a.ts", now - 80, "TEST-1"),
+            _make_activity("Edit", "/src/b.ts", now - 70, "TEST-1"),
+            _make_activity("Edit", "/src/c.ts", now - 60, "TEST-2"),
+            _make_activity("Bash", None, now - 50, "TEST-2"),
+        ])
+
+        chunks = _drain(project_root)["workChunks"]
+        assert [(c["issueKey"], c["startTime"], c["endTime"]) for c in chunks] == [
+            ("TEST-1", now - 90, now - 70),
+            ("TEST-2", now - 60, now - 50),
+        ]
+        assert chunks[0]["filesChanged"] == ["/src/b.ts", "/src/a.ts"]
+        assert chunks[1]["filesChanged"] == ["/src/c.ts"]
+        assert [len(c["activities"]) for c in chunks] == [3, 2]
@@ -3,27 +3,40 @@
 import base64
 import io
 import json
-import sys
-import os
+import time
 from http.client import HTTPResponse
 from unittest.mock import MagicMock, patch, call
 
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
 
+class _Response:
+    """Minimal stand-in for a urllib response: status, read(), getheader()."""
+
+    def __init__(self, data, status, headers):
+        self.status = status
+        self._data = data
+        self._headers = headers or {}
+
+    def read(self):
+        return self._data
+
+    def getheader(self, name, default=None):
+        return self._headers.get(name, default)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
 def _make_response(body, status=200, headers=None):
-    """Create a mock urllib response object."""
+    """Create a fake urllib response object."""
     data = json.dumps(body).encode("utf-8") if isinstance(body, (dict, list)) else body.encode("utf-8")
-    resp = MagicMock()
-    resp.status = status
-    resp.read.return_value = data
-    resp.getheader.side_effect = lambda name, default=None: (headers or {}).get(name, default)
-    resp.__enter__ = MagicMock(return_value=resp)
-    resp.__exit__ = MagicMock(return_value=False)
-    return resp
+    return _Response(data, status, headers)
 
 
 def _setup_creds(project_root):
@@ -44,7 +57,7 @@ def _setup_creds(project_root):
 class TestJiraRequest:
     """Tests for jira_request() — authenticated HTTP request helper."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_sends_correct_auth_header(self, mock_urlopen, project_root):
         """jira_request() sends Basic auth with base64-encoded email:token."""
         _setup_creds(project_root)
@@ -58,7 +71,20 @@ class TestJiraRequest:
         expected = "Basic " + base64.b64encode(b"test@example.com:fake-token-123").decode()
         assert auth_header == expected
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
+    def test_auth_header_encoded_once_per_credential_pair(self, mock_urlopen, project_root):
+        """Repeated requests reuse the encoded Basic auth value."""
+        _setup_creds(project_root)
+        mock_urlopen.return_value = _make_response({"ok": True})
+        jira_core._basic_auth.cache_clear()
+
+        for _ in range(3):
+            jira_core.jira_request(str(project_root), "GET", "/rest/api/3/myself")
+
+        info = jira_core._basic_auth.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    @patch("jira_core._http_open")
     def test_sends_json_content_type(self, mock_urlopen, project_root):
         """jira_request() sets Content-Type and Accept to application/json."""
         _setup_creds(project_root)
@@ -69,7 +95,7 @@ class TestJiraRequest:
         req = mock_urlopen.call_args[0][0]
         assert req.get_header("Content-type") == "application/json"
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_handles_401_unauthorized(self, mock_urlopen, project_root):
         """jira_request() returns error dict on 401 (bad credentials)."""
         _setup_creds(project_root)
@@ -83,7 +109,22 @@ class TestJiraRequest:
 
         assert result.get("error") or result == {} or "error" in str(result).lower()
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
+    def test_http_error_logged_to_api_log(self, mock_urlopen, project_root):
+        """HTTP failures are written to the (per-test) API log."""
+        _setup_creds(project_root)
+        from urllib.error import HTTPError
+        mock_urlopen.side_effect = HTTPError(
+            url="https://test.atlassian.net/rest/api/3/myself",
+            code=401, msg="Unauthorized", hdrs={}, fp=io.BytesIO(b""),
+        )
+
+        jira_core.jira_request(str(project_root), "GET", "/rest/api/3/myself")
+
+        with open(jira_core.API_LOG_PATH) as f:
+            assert "HTTP 401 GET /rest/api/3/myself" in f.read()
+
+    @patch("jira_core._http_open")
     def test_handles_404_not_found(self, mock_urlopen, project_root):
         """jira_request() returns error on 404 (resource not found)."""
         _setup_creds(project_root)
@@ -97,8 +138,9 @@ class TestJiraRequest:
 
         assert result.get("error") or result == {}
 
-    @patch("urllib.request.urlopen")
-    def test_handles_429_rate_limit_with_retry(self, mock_urlopen, project_root):
+    @patch("time.sleep")
+    @patch("jira_core._http_open")
+    def test_handles_429_rate_limit_with_retry(self, mock_urlopen, mock_sleep, project_root):
         """jira_request() retries on 429 (rate limited) then succeeds."""
         _setup_creds(project_root)
         from urllib.error import HTTPError
@@ -117,12 +159,45 @@ class TestJiraRequest:
         # Should have retried at least once
         assert mock_urlopen.call_count >= 2
         assert result.get("accountId") == "abc123"
+        assert mock_sleep.call_args.args[0] >= 1
+
+    def test_retry_delay_honors_retry_after_with_jitter(self, monkeypatch):
+        """Backoff is never shorter than Retry-After and adds at most 50% jitter."""
+        monkeypatch.setattr("random.uniform", lambda lo, hi: hi)
+        assert jira_core._retry_delay(0, 429, {"Retry-After": "3"}) == 4.5
+        assert jira_core._retry_delay(2, 429, {}) == 6
+        assert jira_core._retry_delay(0, 429, {"Retry-After": "6"}) == jira_core.RETRY_MAX_DELAY
+
+    def test_retry_delay_gives_up_on_long_waits(self):
+        """A Retry-After beyond the cap, or a bare 503, is not retried."""
+        assert jira_core._retry_delay(0, 429, {"Retry-After": "120"}) is None
+        assert jira_core._retry_delay(0, 503, {}) is None
+        assert jira_core._retry_delay(0, 503, {"Retry-After": "1"}) is not None
+
+    @patch("time.sleep")
+    @patch("jira_core._http_open")
+    def test_long_retry_after_returns_error_without_sleeping(self, mock_urlopen, mock_sleep, project_root):
+        """jira_request() does not block the hook on a long Retry-After."""
+        _setup_creds(project_root)
+        from urllib.error import HTTPError
+        err = HTTPError(
+            url="https://test.atlassian.net/rest/api/3/myself",
+            code=429, msg="Rate Limited",
+            hdrs={"Retry-After": "300"}, fp=io.BytesIO(b""),
+        )
+        mock_urlopen.side_effect = err
+
+        result = jira_core.jira_request(str(project_root), "GET", "/rest/api/3/myself")
+
+        assert "error" in result
+        assert mock_urlopen.call_count == 1
+        mock_sleep.assert_not_called()
 
 
 class TestJiraGetProjects:
     """Tests for jira_get_projects() — project listing with pagination."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_fetches_projects(self, mock_urlopen, project_root):
         """jira_get_projects() returns list of {key, name} dicts."""
         _setup_creds(project_root)
@@ -141,7 +216,7 @@ class TestJiraGetProjects:
         assert result[0]["key"] == "PROJ"
         assert result[1]["name"] == "Test Project"
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_handles_pagination(self, mock_urlopen, project_root):
         """jira_get_projects() fetches multiple pages when isLast=False."""
         _setup_creds(project_root)
@@ -166,7 +241,29 @@ class TestJiraGetProjects:
         assert "P1" in keys
         assert "P2" in keys
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
+    def test_fetches_remaining_pages_concurrently_in_order(self, mock_urlopen, project_root):
+        """With a total on the first page, later pages are fetched by offset and kept in order."""
+        _setup_creds(project_root)
+        projects = [{"key": f"P{i}", "name": f"Project {i}"} for i in range(5)]
+
+        def respond(req):
+            start = int(req.full_url.split("startAt=")[1].split("&")[0])
+            return _make_response({
+                "values": projects[start:start + 2],
+                "isLast": start + 2 >= len(projects),
+                "startAt": start,
+                "maxResults": 2,
+                "total": len(projects),
+            })
+        mock_urlopen.side_effect = respond
+
+        result = jira_core.jira_get_projects(str(project_root))
+
+        assert [p["key"] for p in result] == ["P0", "P1", "P2", "P3", "P4"]
+        assert mock_urlopen.call_count == 3
+
+    @patch("jira_core._http_open")
     def test_returns_empty_on_network_failure(self, mock_urlopen, project_root):
         """jira_get_projects() returns [] when network is unavailable."""
         _setup_creds(project_root)
@@ -180,7 +277,7 @@ class TestJiraGetProjects:
 class TestCreateIssue:
     """Tests for create_issue() — Jira issue creation."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_sends_correct_payload(self, mock_urlopen, project_root):
         """create_issue() posts correct fields to POST /rest/api/3/issue."""
         _setup_creds(project_root)
@@ -206,7 +303,7 @@ class TestCreateIssue:
         assert "description" in body["fields"]
         assert result["key"] == "TEST-42"
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_description_uses_adf_format(self, mock_urlopen, project_root):
         """create_issue() converts plain text description to ADF."""
         _setup_creds(project_root)
@@ -230,7 +327,7 @@ class TestCreateIssue:
 class TestAddWorklog:
     """Tests for add_worklog() — posting time entries."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_sends_time_spent_in_jira_notation(self, mock_urlopen, project_root):
         """add_worklog() converts seconds to Jira time notation (e.g. '1h 30m')."""
         _setup_creds(project_root)
@@ -248,7 +345,7 @@ class TestAddWorklog:
         # Should contain timeSpentSeconds or timeSpent
         assert body.get("timeSpentSeconds") == 5400 or body.get("timeSpent") == "1h 30m"
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_comment_in_adf_format(self, mock_urlopen, project_root):
         """add_worklog() sends comment in ADF format."""
         _setup_creds(project_root)
@@ -270,7 +367,7 @@ class TestAddWorklog:
 class TestGetIssue:
     """Tests for get_issue() — fetching issue details."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_returns_issue_fields(self, mock_urlopen, project_root):
         """get_issue() fetches and returns issue data from Jira."""
         _setup_creds(project_root)
@@ -287,3 +384,131 @@ class TestGetIssue:
 
         assert result["key"] == "TEST-42"
         assert result["fields"]["summary"] == "Fix login bug"
+
+
+class TestHttpOpen:
+    """Tests for _http_open() — kept-alive connections to the Jira host."""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        peers = []
+        swallowed = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                peers.append(self.client_address)
+                if self.path == "/redirect":
+                    self.send_response(302)
+                    self.send_header("Location", "/a")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.path == "/slow":
+                    time.sleep(0.3)
+                status = 404 if self.path.startswith("/missing") else 200
+                body = json.dumps({"path": self.path}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                peers.append(self.client_address)
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path == "/swallow" and not swallowed:
+                    # Process the request, then drop the connection unanswered
+                    swallowed.append(self.path)
+                    self.close_connection = True
+                    return
+                self.send_response(307 if self.path == "/redirect" else 201)
+                self.send_header("Location", "/a")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_PUT = do_POST
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        monkeypatch.setattr(jira_core, "_HTTP_PROXIES", {})
+        yield f"http://127.0.0.1:{httpd.server_address[1]}", peers
+        httpd.shutdown()
+        httpd.server_close()
+
+    def test_reuses_connection_across_requests(self, server):
+        import urllib.request
+        base, peers = server
+        for path in ("/a", "/b?x=1"):
+            with jira_core._http_open(urllib.request.Request(base + path)) as resp:
+                assert json.loads(resp.read())["path"] == path
+        assert len(peers) == 2
+        assert peers[0] == peers[1]
+
+    def test_error_status_raises_http_error(self, server):
+        import urllib.request
+        from urllib.error import HTTPError
+        base, _ = server
+        with pytest.raises(HTTPError) as exc:
+            jira_core._http_open(urllib.request.Request(base + "/missing"))
+        assert exc.value.code == 404
+
+    def test_follows_redirects(self, server):
+        import urllib.request
+        base, _ = server
+        with jira_core._http_open(urllib.request.Request(base + "/redirect")) as resp:
+            assert json.loads(resp.read())["path"] == "/a"
+
+    def test_redirected_post_is_not_sent_again(self, server):
+        import urllib.request
+        from urllib.error import HTTPError
+        base, peers = server
+        req = urllib.request.Request(base + "/redirect", data=b"{}", method="POST")
+        with pytest.raises(HTTPError) as exc:
+            jira_core._http_open(req)
+        assert exc.value.code == 307
+        assert len(peers) == 1
+
+    def test_proxy_settings_read_once(self, server, monkeypatch):
+        import urllib.request
+        base, _ = server
+        calls = []
+        monkeypatch.setattr(jira_core, "_HTTP_PROXIES", None)
+        monkeypatch.setattr("urllib.request.getproxies", lambda: calls.append(1) or {})
+        for _ in range(2):
+            jira_core._http_open(urllib.request.Request(base + "/a")).read()
+        assert calls == [1]
+
+    def _send_on_reused_connection(self, base, method):
+        import urllib.request
+        jira_core._http_open(urllib.request.Request(base + "/a")).read()
+        return jira_core._http_open(urllib.request.Request(base + "/swallow", data=b"{}", method=method))
+
+    def test_dropped_connection_resends_idempotent_request(self, server):
+        base, peers = server
+        self._send_on_reused_connection(base, "PUT").read()
+        assert len(peers) == 3
+
+    def test_dropped_connection_does_not_resend_post(self, server):
+        import http.client
+        base, peers = server
+        with pytest.raises((http.client.HTTPException, ConnectionError)):
+            self._send_on_reused_connection(base, "POST")
+        assert len(peers) == 2
+
+    def test_unresponsive_server_times_out(self, server, monkeypatch):
+        import urllib.request
+        base, _ = server
+        monkeypatch.setattr(jira_core, "HTTP_TIMEOUT", 0.05)
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            jira_core._http_open(urllib.request.Request(base + "/slow"))
+        assert time.monotonic() - started < 0.3
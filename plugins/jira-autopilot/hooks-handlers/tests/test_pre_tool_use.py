@@ -1,14 +1,12 @@
 """Tests for cmd_pre_tool_use() — git commit message issue key injection."""
 
 import json
-import os
 import sys
 import time
 from unittest.mock import patch
 
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
 
@@ -88,6 +86,17 @@ class TestPreToolUseGitCommit:
         # Should produce no output or empty result for non-Bash tools
         assert output == "" or output == "{}" or "systemMessage" not in output
 
+    def test_non_bash_payload_is_not_parsed(self, project_root):
+        """Payloads that never mention Bash return before JSON parsing."""
+        hook_input = _build_hook_input("Write", {"file_path": "src/a.ts", "content": "x" * 1000})
+
+        with patch("sys.argv", ["jira_core.py", "pre-tool-use", str(project_root)]), \
+             patch("sys.stdin.read", return_value=hook_input), \
+             patch("jira_core._json_loads") as mock_parse:
+            jira_core.cmd_pre_tool_use()
+
+        mock_parse.assert_not_called()
+
     def test_only_activates_for_git_commit_command(self, project_root):
         """cmd_pre_tool_use() ignores Bash commands that are not git commit."""
         _setup_project(project_root)
@@ -1,16 +1,15 @@
 """Tests for cmd_session_end() — session finalization and archival."""
 
 import json
-import os
-import sys
 import time
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
+pytestmark = pytest.mark.usefixtures("frozen_clock")
+
 
 def _setup_project(project_root):
     """Create config and credential files for a test project."""
@@ -63,7 +62,7 @@ def _create_session_with_work(project_root, autonomy="B"):
 class TestSessionEndSavesFirst:
     """Session end must save state locally before any API calls."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_saves_session_before_api_calls(self, mock_urlopen, project_root):
         """cmd_session_end() persists session state before posting to Jira."""
         _setup_project(project_root)
@@ -88,7 +87,7 @@ class TestSessionEndSavesFirst:
 class TestSessionEndWorklogs:
     """Session end builds and posts worklogs."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_builds_worklogs_from_work_chunks(self, mock_urlopen, project_root):
         """cmd_session_end() creates pending worklogs from active issue work chunks."""
         _setup_project(project_root)
@@ -113,7 +112,7 @@ class TestSessionEndWorklogs:
         )
         assert has_worklogs
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_posts_worklogs_to_each_active_issue(self, mock_urlopen, project_root):
         """cmd_session_end() posts time to every active issue with work."""
         _setup_project(project_root)
@@ -156,11 +155,11 @@ class TestSessionEndWorklogs:
 class TestSessionEndArchive:
     """Session end archives to .claude/jira-sessions/."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_archives_session(self, mock_urlopen, project_root):
         """cmd_session_end() saves archive to .claude/jira-sessions/<sessionId>.json."""
         _setup_project(project_root)
-        _create_session_with_work(project_root)
+        session = _create_session_with_work(project_root)
         mock_urlopen.return_value = MagicMock(
             status=201,
             read=MagicMock(return_value=b'{"id":"wl-1"}'),
@@ -173,16 +172,29 @@ class TestSessionEndArchive:
         with patch("sys.argv", ["jira_core.py", "session-end", str(project_root)]):
             jira_core.cmd_session_end()
 
-        archive_dir = project_root / ".claude" / "jira-sessions"
-        assert archive_dir.exists()
-        archives = list(archive_dir.glob("*.json"))
-        assert len(archives) >= 1
+        archive = project_root / ".claude" / "jira-sessions" / f"{session['sessionId']}.json"
+        assert archive.is_file()
+
+    @patch("jira_core._http_open")
+    def test_archive_write_is_not_fsynced(self, mock_urlopen, project_root):
+        """Archiving an idle session issues no fsync."""
+        _setup_project(project_root)
+        session = jira_core._new_session()
+        session["activeIssues"] = {}
+        jira_core.save_session(str(project_root), session)
+
+        with patch("sys.argv", ["jira_core.py", "session-end", str(project_root)]), \
+             patch("jira_core._fdatasync") as mock_fsync:
+            jira_core.cmd_session_end()
+
+        assert (project_root / ".claude" / "jira-sessions" / f"{session['sessionId']}.json").is_file()
+        mock_fsync.assert_not_called()
 
 
 class TestSessionEndErrorHandling:
     """Session end handles failures gracefully."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_api_failure_does_not_lose_data(self, mock_urlopen, project_root):
         """When Jira API fails, session data is still saved locally."""
         _setup_project(project_root)
@@ -203,7 +215,7 @@ class TestSessionEndErrorHandling:
         session_exists = bool(session) or archive_dir.exists()
         assert session_exists
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_empty_session_no_work(self, mock_urlopen, project_root):
         """cmd_session_end() handles a session with no work done gracefully."""
         _setup_project(project_root)
@@ -225,7 +237,7 @@ class TestSessionEndErrorHandling:
 class TestSessionEndComment:
     """Session end posts work summary comments."""
 
-    @patch("urllib.request.urlopen")
+    @patch("jira_core._http_open")
     def test_posts_work_summary_comment(self, mock_urlopen, project_root):
         """cmd_session_end() posts a summary comment to each active issue."""
         _setup_project(project_root)
@@ -1,9 +1,6 @@
 import json
-import sys
-import os
 from unittest.mock import patch
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
 
@@ -29,6 +26,19 @@ class TestCmdSessionStart:
         assert session["activeIssues"] == {} or isinstance(session["activeIssues"], dict)
         assert session["activityBuffer"] == [] or isinstance(session["activityBuffer"], list)
 
+    def test_new_session_drops_leftover_activity_log(self, project_root):
+        """Activities of a missing or corrupt session must not leak into a new one."""
+        cfg_path = project_root / ".claude" / "jira-autopilot.json"
+        cfg_path.write_text(json.dumps({"projectKey": "TEST", "enabled": True}))
+        (project_root / ".claude" / "jira-session.json").write_text("{corrupt")
+        jira_core.append_activity(str(project_root), {"tool": "Edit", "file": "/src/old.ts"})
+
+        with patch("sys.argv", ["jira_core.py", "session-start", str(project_root)]):
+            jira_core.cmd_session_start()
+
+        session = jira_core.load_session(str(project_root))
+        assert session["activityBuffer"] == []
+
     def test_loads_existing_session_and_ensures_structure(self, project_root):
         """Existing session should be loaded and missing fields filled in."""
         cfg_path = project_root / ".claude" / "jira-autopilot.json"
@@ -74,6 +84,35 @@ class TestCmdSessionStart:
         assert session.get("currentIssue") == "TEST-42"
         assert "TEST-42" in session.get("activeIssues", {})
 
+    def test_reads_branch_from_git_head_without_forking(self, project_root):
+        """A .git/HEAD under root is read directly; git is not run."""
+        cfg_path = project_root / ".claude" / "jira-autopilot.json"
+        cfg_path.write_text(json.dumps({
+            "projectKey": "TEST",
+            "enabled": True,
+            "branchPattern": r"^(?:feature|fix|hotfix|chore|docs)/(TEST-\d+)",
+        }))
+        (project_root / ".git").mkdir()
+        (project_root / ".git" / "HEAD").write_text("ref: refs/heads/fix/TEST-7-null-check\n")
+
+        with patch("sys.argv", ["jira_core.py", "session-start", str(project_root)]), \
+             patch("subprocess.check_output") as mock_git:
+            jira_core.cmd_session_start()
+
+        mock_git.assert_not_called()
+        assert jira_core.load_session(str(project_root)).get("currentIssue") == "TEST-7"
+
+    def test_current_branch_detached_and_fallback(self, project_root):
+        """Detached HEAD reads as "HEAD"; without .git/ the git fallback is used."""
+        root = str(project_root)
+        with patch("subprocess.check_output", return_value=b"main\n") as mock_git:
+            assert jira_core._current_branch(root) == "main"
+        assert mock_git.call_args.kwargs["cwd"] == root
+
+        (project_root / ".git").mkdir()
+        (project_root / ".git" / "HEAD").write_text("0123456789abcdef0123456789abcdef01234567\n")
+        assert jira_core._current_branch(root) == "HEAD"
+
     def test_sets_autonomy_level_and_accuracy_from_config(self, project_root):
         """Session should inherit autonomyLevel and accuracy from project config."""
         cfg_path = project_root / ".claude" / "jira-autopilot.json"
@@ -1,10 +1,7 @@
 import json
-import sys
-import os
 import time
 from unittest.mock import patch
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import jira_core
 
 
@@ -167,6 +164,37 @@ class TestBuildWorklog:
         assert result["seconds"] >= 200, \
             "Null chunks should be included when there is only one active issue"
 
+    def test_dedupes_files_and_sanitized_commands_in_order(self, project_root):
+        """Files and commands repeated across chunks are listed once, first-seen first."""
+        cfg_path = project_root / ".claude" / "jira-autopilot.json"
+        cfg_path.write_text(json.dumps({
+            "projectKey": "TEST", "enabled": True,
+        }))
+
+        now = int(time.time())
+        token_cmd = "curl -u me@x.com:ATATT3xSECRET https://x.atlassian.net"
+        session = jira_core._new_session()
+        session["activeIssues"] = {"TEST-1": {"summary": "Task", "startTime": now - 600}}
+        session["workChunks"] = [
+            {
+                "issueKey": "TEST-1", "startTime": now - 600, "endTime": now - 500,
+                "activities": [{"command": token_cmd}, {"command": "npm test"}],
+                "filesChanged": ["/src/b.ts", "/src/a.ts"], "idleGaps": [],
+            },
+            {
+                "issueKey": "TEST-1", "startTime": now - 400, "endTime": now - 300,
+                "activities": [{"command": token_cmd}, {"command": ""}],
+                "filesChanged": ["/src/a.ts", "/src/c.ts"], "idleGaps": [],
+            },
+        ]
+        jira_core.save_session(str(project_root), session)
+
+        facts = jira_core.build_worklog(str(project_root), "TEST-1")["rawFacts"]
+
+        assert facts["files"] == ["/src/b.ts", "/src/a.ts", "/src/c.ts"]
+        assert facts["commands"] == ["curl -u [REDACTED] https://x.atlassian.net", "npm test"]
+        assert facts["activityCount"] == 4
+
 
 class TestFormatJiraTime:
     """Tests for Jira time notation formatting."""